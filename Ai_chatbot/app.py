@@ -2,22 +2,38 @@ import streamlit as st
 from dotenv import load_dotenv
 import os
 import uuid
-
-from langchain_ollama import ChatOllama
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.messages import HumanMessage
-from langchain_classic.memory import ConversationBufferMemory
-from langchain_community.utilities import SerpAPIWrapper
+import hashlib
+
+# LangChain and SerpAPI are imported inside the functions that use them,
+# so the landing page doesn't pay for them
+
+# shared modules live in the project root, which must be on the import path.
+# `streamlit run Ai_chatbot/app.py` only adds Ai_chatbot/, so run from the
+# project root with:
+#   python -m streamlit run Ai_chatbot/app.py
+# or set PYTHONPATH to the project root.
+try:
+    from llm_registry import get_llm
+    from question_bank import RETRIEVAL_BACKEND, retrieve_context
+    from metrics import start_exporter
+except ImportError as e:
+    st.error(
+        f"Could not import the shared interviewer modules ({e}). Run the app from the project root "
+        "with `python -m streamlit run Ai_chatbot/app.py`, or set PYTHONPATH to the project root."
+    )
+    st.stop()
 
 # load env 
 load_dotenv()
 SERPAPI_API_KEY = os.getenv("SERPAPI_API_KEY")
 
-if not SERPAPI_API_KEY:
+# the key is only needed when web search is enabled
+if not SERPAPI_API_KEY and RETRIEVAL_BACKEND != "local":
     st.error("SERPAPI_API_KEY not found in .env")
     st.stop()
 
 st.set_page_config(page_title="AI Professional Interviewer", page_icon="🤖")
+start_exporter()
 
 # session state
 if "interviews" not in st.session_state:
@@ -29,14 +45,18 @@ if "active_interview_id" not in st.session_state:
 
 # helpers
 def create_interview():
+    from langchain_classic.memory import ConversationBufferMemory
+
     iid = str(uuid.uuid4())
     st.session_state.interviews[iid] = {
+        "id": iid,
         "memory": ConversationBufferMemory(return_messages=True),
         "stage": "setup",
         "company": "",
         "role": "",
         "type": "",
-        "web_context": ""
+        "web_context": "",
+        "feedback": None
     }
     st.session_state.active_interview_id = iid
     st.rerun()
@@ -52,21 +72,24 @@ def active_interview():
 
 # websearching
 def fetch_web_context(company, role, interview_type):
-    with st.spinner("Searching..."):
+    # local question bank and/or SerpAPI, see RETRIEVAL_BACKEND
+    def web_search():
+        from langchain_community.utilities import SerpAPIWrapper
+
         search = SerpAPIWrapper(serpapi_api_key=SERPAPI_API_KEY)
-        query = (
+        return search.run(
             f"{company} {role} {interview_type} interview questions "
             f"real candidate experience"
         )
-        try:
-            result = search.run(query)
-            return result[:3500]
-        except Exception:
-            return ""
+
+    with st.spinner("Searching..."):
+        return retrieve_context(role, "", interview_type, web_search=web_search, limit=3500)
         
 
 # chain main logic
 def interviewer_chain(web_context, company, role, interview_type):
+    from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+
     prompt = ChatPromptTemplate.from_messages([
         (
             "system",
@@ -95,7 +118,7 @@ Behavior Rules:
         ("human", "{input}")
     ])
 
-    llm = ChatOllama(model="deepseek-r1:1.5b")
+    llm = get_llm("ai_chatbot")
     return prompt | llm
 
 
@@ -124,6 +147,42 @@ def ask_next_question(interview, user_answer=""):
     interview["memory"].chat_memory.add_ai_message(response)
 
 
+# feedback (cached per transcript so reruns don't regenerate it)
+def transcript_hash(messages):
+    digest = hashlib.sha256()
+    for msg in messages:
+        digest.update(msg.type.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(msg.content.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def generate_feedback(interview):
+    memory = interview["memory"]
+    cache_key = f"{interview['id']}:{transcript_hash(memory.chat_memory.messages)}"
+
+    cached = interview.get("feedback")
+    if cached and cached["key"] == cache_key:
+        return cached["content"]
+
+    from langchain_core.messages import HumanMessage
+
+    llm = get_llm("ai_chatbot")
+    history = memory.load_memory_variables({})["history"]
+
+    content = llm.invoke(
+        history + [
+            HumanMessage(
+                content="Provide a professional interview evaluation. Include strengths, weaknesses, communication skills, and improvement suggestions."
+            )
+        ]
+    ).content
+
+    interview["feedback"] = {"key": cache_key, "content": content}
+    return content
+
+
 # app sidebar
 with st.sidebar:
     st.title(" Interviews")
@@ -187,7 +246,7 @@ if interview["stage"] == "setup":
 elif interview["stage"] == "interview":
 
     for msg in memory.chat_memory.messages:
-        role = "user" if isinstance(msg, HumanMessage) else "assistant"
+        role = "user" if msg.type == "human" else "assistant"
         with st.chat_message(role):
             st.markdown(msg.content)
 
@@ -213,15 +272,6 @@ elif interview["stage"] == "feedback":
 
     st.subheader(" Interview Feedback")
 
-    llm = ChatOllama(model="deepseek-r1:1.5b")
-    history = memory.load_memory_variables({})["history"]
-
-    feedback = llm.invoke(
-        history + [
-            HumanMessage(
-                content="Provide a professional interview evaluation. Include strengths, weaknesses, communication skills, and improvement suggestions."
-            )
-        ]
-    )
+    feedback = generate_feedback(interview)
 
-    st.success(feedback.content)
+    st.success(feedback)
\ No newline at end of file
@@ -1,16 +1,22 @@
 import streamlit as st
-from datetime import datetime, timedelta
-from langchain_core.messages import HumanMessage
+from datetime import datetime
 
 from interviewer import (
     new_interview,
     delete_interview,
     get_active,
+    init_interviews,
+    list_interviews,
     ask_question,
-    check_timer
+    start_prefetch,
+    check_timer,
+    generate_feedback
 )
 
 from support_chatbot import init_support_chat, render_support_chat
+from transcript_view import message_html, render_transcript
+from interview_deadlines import INTERVIEW_MINUTES, deadline_scheduler, time_remaining
+from metrics import start_exporter
 
 # -------------------- PAGE CONFIG --------------------
 st.set_page_config(
@@ -19,6 +25,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# metrics endpoint / file, if METRICS_PORT or METRICS_FILE is set (once per process)
+start_exporter()
+
 # Custom CSS for better UI
 st.markdown("""
 <style>
@@ -125,12 +134,28 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# -------------------- SESSION STORAGE --------------------
-if "interviews" not in st.session_state:
-    st.session_state.interviews = {}
+# -------------------- COUNTDOWN --------------------
+@st.fragment(run_every=1)
+def render_countdown(interview):
+    # Ticks on its own every second without rerunning the page
+    remaining = time_remaining(interview)
+    if remaining is None:
+        return
+    
+    if remaining.total_seconds() > 0 and interview["stage"] == "interview":
+        minutes, seconds = divmod(int(remaining.total_seconds()), 60)
+        st.markdown(f'<div class="timer">⏱️ Time: {minutes}:{seconds:02d}</div>', 
+                   unsafe_allow_html=True)
+    else:
+        st.markdown('<div class="timer" style="background: #dc3545;">⏱️ Time\'s up!</div>', 
+                   unsafe_allow_html=True)
+        # Deadline passed (or the scheduler already ended it): full rerun into feedback
+        interview["stage"] = "feedback"
+        st.rerun()
 
-if "active_interview_id" not in st.session_state:
-    st.session_state.active_interview_id = None
+# -------------------- SESSION STORAGE --------------------
+# Loaded interviews only; everything else stays in the interview store
+init_interviews(st.session_state)
 
 # Initialize support chatbot memory
 init_support_chat(st.session_state)
@@ -149,12 +174,14 @@ with st.sidebar:
     
     st.divider()
     
-    # Interview List
-    if st.session_state.interviews:
+    # Interview List (summaries only; a transcript loads when opened)
+    summaries = list_interviews(st.session_state)
+    if summaries:
         st.subheader("Your Interviews")
-        for iid, interview in st.session_state.interviews.copy().items():
-            title = interview.get("company") or "New Interview"
-            role = interview.get("role") or "No role specified"
+        for summary in summaries:
+            iid = summary["id"]
+            title = summary["company"] or "New Interview"
+            role = summary["role"] or "No role specified"
             
             cols = st.columns([3, 1])
             
@@ -229,7 +256,7 @@ interview = get_active(st.session_state)
 if not interview:
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
-        st.markdown("""
+        st.markdown(f"""
         <div style='text-align: center; padding: 50px;'>
             <h1>🤖 AI Professional Interviewer</h1>
             <p style='font-size: 18px; color: #666; margin: 30px 0;'>
@@ -241,7 +268,7 @@ if not interview:
                 <ol style='text-align: left; display: inline-block; margin: 20px auto;'>
                     <li>Click <strong>"Start New Interview"</strong> in the sidebar</li>
                     <li>Fill in your interview details</li>
-                    <li>Practice for 15 minutes with our AI interviewer</li>
+                    <li>Practice for {INTERVIEW_MINUTES} minutes with our AI interviewer</li>
                     <li>Receive instant feedback</li>
                 </ol>
             </div>
@@ -332,11 +359,17 @@ if interview["stage"] == "setup":
                             f"I'm your AI interviewer today. "
                             f"{interview_desc} "
                             f"We will focus on your skills in {skills if skills else 'Python, AI, and ML'}. "
-                            f"The interview will last 15 minutes. "
+                            f"The interview will last {INTERVIEW_MINUTES} minutes. "
                             f"Are you ready to begin?"
                         )
                         
                         memory.chat_memory.add_ai_message(greeting)
+                        
+                        # Ends the interview on time even if the candidate stops typing
+                        deadline_scheduler.schedule(interview)
+                        
+                        # Question style and first question are prepared while the greeting is read
+                        start_prefetch(interview)
                         st.rerun()
         
         with col2:
@@ -371,51 +404,16 @@ elif interview["stage"] == "interview":
     
     with col2:
         # Timer
-        if interview.get("start_time"):
-            elapsed = datetime.now() - interview["start_time"]
-            remaining = timedelta(minutes=15) - elapsed
-            
-            if remaining.total_seconds() > 0:
-                minutes, seconds = divmod(int(remaining.total_seconds()), 60)
-                st.markdown(f'<div class="timer">⏱️ Time: {minutes}:{seconds:02d}</div>', 
-                           unsafe_allow_html=True)
-            else:
-                st.markdown('<div class="timer" style="background: #dc3545;">⏱️ Time\'s up!</div>', 
-                           unsafe_allow_html=True)
+        render_countdown(interview)
     
     st.divider()
     
     # Chat messages container
     chat_container = st.container(height=500)
     
+    # Rendered from cached per-message HTML in its own fragment
     with chat_container:
-        for msg in memory.chat_memory.messages:
-            role_type = "user" if isinstance(msg, HumanMessage) else "assistant"
-            
-            if role_type == "user":
-                st.markdown(f"""
-                <div style='text-align: right; margin: 10px 0;'>
-                    <div style='background: #4F46E5; color: white; padding: 12px; 
-                         border-radius: 15px 15px 0 15px; display: inline-block; max-width: 80%;'>
-                        {msg.content}
-                    </div>
-                    <div style='font-size: 12px; color: #666; text-align: right; padding: 2px 10px;'>
-                        👤 You
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                <div style='text-align: left; margin: 10px 0;'>
-                    <div style='background: #f0f0f0; color: #333; padding: 12px; 
-                         border-radius: 15px 15px 15px 0; display: inline-block; max-width: 80%;'>
-                        {msg.content}
-                    </div>
-                    <div style='font-size: 12px; color: #666; text-align: left; padding: 2px 10px;'>
-                        🤖 AI Interviewer
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+        render_transcript(interview)
     
     # Chat input at bottom
     if check_timer(interview):
@@ -440,7 +438,15 @@ elif interview["stage"] == "interview":
             interview["stage"] = "feedback"
             st.rerun()
         else:
-            ask_question(interview, user_input)
+            # Stream the reply into the transcript as it is generated
+            with chat_container:
+                st.markdown(message_html("user", user_input), unsafe_allow_html=True)
+                ask_question(
+                    interview,
+                    user_input,
+                    placeholder=st.empty(),
+                    format_message=lambda text: message_html("assistant", text)
+                )
         st.rerun()
 
 # -------------------- FEEDBACK STAGE --------------------
@@ -448,23 +454,9 @@ elif interview["stage"] == "feedback":
     st.title("📊 Interview Feedback")
     st.markdown('<div class="interview-container">', unsafe_allow_html=True)
     
+    # Cached on the interview record, so reruns don't hit the LLM again
     with st.spinner("Generating your feedback..."):
-        from langchain_ollama import ChatOllama
-        llm = ChatOllama(model="mistral:latest")
-        
-        history = memory.load_memory_variables({})["history"]
-        
-        feedback_prompt = (
-            f"Please provide professional interview feedback for the candidate {interview['candidate_name']} "
-            f"who interviewed for {interview['role']} at {interview['company']}. "
-            f"The interview was {interview['type']} type focusing on {interview['skills']}. "
-            "Provide specific feedback on: strengths, areas for improvement, and overall performance. "
-            "Format it nicely with clear sections and bullet points."
-        )
-        
-        feedback = llm.invoke(
-            history + [HumanMessage(content=feedback_prompt)]
-        )
+        feedback = generate_feedback(interview)
     
     # Display feedback in a nice format
     st.markdown("### 🎯 Overall Performance")
@@ -474,18 +466,18 @@ elif interview["stage"] == "feedback":
     
     with col1:
         st.markdown("### ✅ **Strengths**")
-        st.success(feedback.content.split("Strengths:")[1].split("Areas for Improvement:")[0] 
-                  if "Strengths:" in feedback.content else "Good overall performance")
+        st.success(feedback.split("Strengths:")[1].split("Areas for Improvement:")[0] 
+                  if "Strengths:" in feedback else "Good overall performance")
     
     with col2:
         st.markdown("### 📝 **Areas for Improvement**")
-        st.warning(feedback.content.split("Areas for Improvement:")[1].split("Overall Performance:")[0] 
-                  if "Areas for Improvement:" in feedback.content else "Keep practicing!")
+        st.warning(feedback.split("Areas for Improvement:")[1].split("Overall Performance:")[0] 
+                  if "Areas for Improvement:" in feedback else "Keep practicing!")
     
     st.divider()
     
     st.markdown("### 📋 **Detailed Feedback**")
-    st.markdown(feedback.content)
+    st.markdown(feedback)
     
     st.divider()
     
@@ -511,7 +503,7 @@ elif interview["stage"] == "feedback":
             Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
             
             FEEDBACK:
-            {feedback.content}
+            {feedback}
             """
             
             st.download_button(
@@ -0,0 +1,229 @@
+import asyncio
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+from dotenv import load_dotenv
+
+from metrics import span
+
+# --------------------------------------------------
+# CONFIG
+# --------------------------------------------------
+
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://localhost/ai_interviewer")
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+DB_QUERY_TIMEOUT = float(os.getenv("DB_QUERY_TIMEOUT", "30"))
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "256"))
+
+
+# --------------------------------------------------
+# PLACEHOLDERS
+# --------------------------------------------------
+# Queries keep the psycopg-style "%s" placeholders used across the backend
+# and are rewritten once per distinct statement for the active driver.
+
+_PLACEHOLDER = re.compile(r"%%|%s")
+
+
+@lru_cache(maxsize=DB_STATEMENT_CACHE_SIZE)
+def _to_numbered(sql: str) -> str:
+    counter = iter(range(1, 10_000))
+    return _PLACEHOLDER.sub(lambda m: "%" if m.group() == "%%" else f"${next(counter)}", sql)
+
+
+@lru_cache(maxsize=DB_STATEMENT_CACHE_SIZE)
+def _to_qmark(sql: str) -> str:
+    return _PLACEHOLDER.sub(lambda m: "%" if m.group() == "%%" else "?", sql)
+
+
+def _label(sql: str) -> str:
+    return " ".join(sql.split())[:80]
+
+
+# --------------------------------------------------
+# DRIVERS
+# --------------------------------------------------
+
+class _PostgresDriver:
+
+    def __init__(self, url: str):
+        self.url = url
+        self.pool = None
+
+    async def connect(self) -> None:
+        import asyncpg
+
+        self.pool = await asyncpg.create_pool(
+            self.url,
+            min_size=DB_POOL_MIN_SIZE,
+            max_size=DB_POOL_MAX_SIZE,
+            statement_cache_size=DB_STATEMENT_CACHE_SIZE,
+            command_timeout=DB_QUERY_TIMEOUT
+        )
+
+    async def close(self) -> None:
+        if self.pool:
+            await self.pool.close()
+
+    async def fetch(self, sql: str, params: Sequence[Any]) -> List[Dict[str, Any]]:
+        async with self.pool.acquire(timeout=DB_POOL_TIMEOUT) as conn:
+            rows = await conn.fetch(_to_numbered(sql), *params)
+        return [dict(row) for row in rows]
+
+    async def execute(self, sql: str, params: Sequence[Any]) -> None:
+        async with self.pool.acquire(timeout=DB_POOL_TIMEOUT) as conn:
+            await conn.execute(_to_numbered(sql), *params)
+
+
+class _SQLiteDriver:
+    """
+    Local stand-in: a fixed set of sqlite3 connections, each used by one
+    pool thread at a time, so queries never run on the event loop.
+    """
+
+    def __init__(self, url: str):
+        self.path = url.split("sqlite:///", 1)[-1]
+
+        # every pooled connection would open its own, empty in-memory database
+        if self.path in ("", ":memory:") or "mode=memory" in self.path:
+            raise ValueError("DATABASE_URL: in-memory SQLite can't be pooled; use a file, e.g. sqlite:///app.db")
+
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.connections: Optional[asyncio.Queue] = None
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=DB_QUERY_TIMEOUT,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=DB_STATEMENT_CACHE_SIZE
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    async def connect(self) -> None:
+        self.executor = ThreadPoolExecutor(max_workers=DB_POOL_MAX_SIZE, thread_name_prefix="sqlite")
+        self.connections = asyncio.Queue()
+        for _ in range(DB_POOL_MAX_SIZE):
+            self.connections.put_nowait(self._open())
+
+    async def close(self) -> None:
+        if self.connections:
+            while not self.connections.empty():
+                self.connections.get_nowait().close()
+        if self.executor:
+            self.executor.shutdown(wait=False)
+
+    async def _run(self, sql: str, params: Sequence[Any], fetch: bool):
+        conn = await asyncio.wait_for(self.connections.get(), DB_POOL_TIMEOUT)
+        loop = asyncio.get_running_loop()
+
+        def work():
+            cursor = conn.execute(_to_qmark(sql), tuple(params))
+            return [dict(row) for row in cursor.fetchall()] if fetch else None
+
+        def release(_) -> None:
+            try:
+                loop.call_soon_threadsafe(self.connections.put_nowait, conn)
+            except RuntimeError:
+                # loop already closed; the pool is gone with it
+                conn.close()
+
+        # The connection goes back to the pool when the job is done, not when
+        # the caller stops waiting: after a timeout (cancellation) it stays
+        # checked out until the statement has really finished.
+        job = self.executor.submit(work)
+        job.add_done_callback(release)
+        try:
+            return await asyncio.wrap_future(job)
+        except asyncio.CancelledError:
+            # stop a statement nobody is waiting for, so the connection frees up
+            if not job.done():
+                conn.interrupt()
+            raise
+
+    async def fetch(self, sql: str, params: Sequence[Any]) -> List[Dict[str, Any]]:
+        return await self._run(sql, params, fetch=True)
+
+    async def execute(self, sql: str, params: Sequence[Any]) -> None:
+        await self._run(sql, params, fetch=False)
+
+
+# --------------------------------------------------
+# DATABASE
+# --------------------------------------------------
+
+class AsyncDatabase:
+    """
+    Connection-pooled async database access.
+    Uses asyncpg for PostgreSQL and a thread-backed sqlite3 pool for
+    "sqlite:///" URLs. Every query is timed per statement.
+    """
+
+    def __init__(self, url: str = DATABASE_URL):
+        self.url = url
+        self._driver = None
+        self._connect_lock = asyncio.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    async def connect(self) -> None:
+        async with self._connect_lock:
+            if self._driver is None:
+                driver = _SQLiteDriver(self.url) if self.url.startswith("sqlite") else _PostgresDriver(self.url)
+                await driver.connect()
+                self._driver = driver
+
+    async def close(self) -> None:
+        if self._driver:
+            await self._driver.close()
+            self._driver = None
+
+    async def _timed(self, sql: str, call):
+        if self._driver is None:
+            await self.connect()
+
+        label = _label(sql)
+        stats = self._stats.setdefault(label, {"count": 0, "errors": 0, "total": 0.0, "max": 0.0})
+        started = time.perf_counter()
+        try:
+            with span("db_query", statement=label):
+                return await asyncio.wait_for(call(), DB_QUERY_TIMEOUT)
+        except Exception:
+            stats["errors"] += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            stats["count"] += 1
+            stats["total"] += elapsed
+            stats["max"] = max(stats["max"], elapsed)
+
+    async def fetch(self, sql: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        return await self._timed(sql, lambda: self._driver.fetch(sql, params))
+
+    async def fetchrow(self, sql: str, params: Sequence[Any] = ()) -> Optional[Dict[str, Any]]:
+        rows = await self.fetch(sql, params)
+        return rows[0] if rows else None
+
+    async def execute(self, sql: str, params: Sequence[Any] = ()) -> None:
+        await self._timed(sql, lambda: self._driver.execute(sql, params))
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Per-statement count, errors, total and max time (seconds)."""
+        return {
+            sql: {**stats, "avg": stats["total"] / stats["count"]}
+            for sql, stats in self._stats.items()
+        }
+
+
+database = AsyncDatabase()
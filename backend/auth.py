@@ -1,14 +1,23 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import hashlib
+import threading
+import time
 import jwt
-import bcrypt
 from fastapi import HTTPException, Security, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import os
 from dotenv import load_dotenv
 
 from models import UserCreate, UserLogin
-from db import db
+from async_db import database
+from passwords import (
+    hash_password,
+    verify_password,
+    hash_password_async,
+    verify_password_async
+)
 
 # --------------------------------------------------
 # ENV + SECURITY
@@ -21,32 +30,7 @@ security = HTTPBearer()
 JWT_SECRET = os.getenv("JWT_SECRET", "change-this-in-production")
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 24
-
-
-# --------------------------------------------------
-# PASSWORD UTILS
-# --------------------------------------------------
-
-def hash_password(password: str) -> str:
-    if len(password) > 72:
-        raise HTTPException(
-            status_code=400,
-            detail="Password cannot exceed 72 characters"
-        )
-
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
-    return hashed.decode("utf-8")
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    try:
-        return bcrypt.checkpw(
-            plain_password.encode("utf-8"),
-            hashed_password.encode("utf-8")
-        )
-    except Exception:
-        return False
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "10000"))
 
 
 # --------------------------------------------------
@@ -63,14 +47,74 @@ def create_token(user_id: int, username: str) -> str:
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 
+class TokenCache:
+    """
+    Bounded LRU of verified JWT claims, keyed by a SHA-256 of the token.
+    Entries expire at the token's own `exp`, so a cached token is never
+    accepted after it would have failed verification.
+    """
+
+    def __init__(self, max_size: int = JWT_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = self._key(token)
+        with self._lock:
+            claims = self._entries.get(key)
+            if claims is None or claims["exp"] <= time.time():
+                if claims is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(claims)
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        if "exp" not in claims:
+            return
+        with self._lock:
+            self._entries[self._key(token)] = dict(claims)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def metrics(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
+token_cache = TokenCache()
+
+
 def verify_token(token: str) -> Dict[str, Any]:
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
+
     try:
-        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        claims = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    token_cache.put(token, claims)
+    return claims
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Security(security)
@@ -97,10 +141,9 @@ class AuthService:
             )
 
         # Check if user exists
-        existing = db.execute(
+        existing = await database.fetch(
             "SELECT user_id FROM users WHERE username = %s OR email = %s",
-            (user_data.username, user_data.email),
-            fetch=True
+            (user_data.username, user_data.email)
         )
 
         if existing:
@@ -109,10 +152,10 @@ class AuthService:
                 detail="Username or email already exists"
             )
 
-        password_hash = hash_password(user_data.password)
+        password_hash = await hash_password_async(user_data.password)
 
         try:
-            user = db.execute(
+            user = await database.fetchrow(
                 """
                 INSERT INTO users (username, email, password_hash, full_name)
                 VALUES (%s, %s, %s, %s)
@@ -123,9 +166,8 @@ class AuthService:
                     user_data.email,
                     password_hash,
                     user_data.full_name
-                ),
-                fetch=True
-            )[0]
+                )
+            )
 
             token = create_token(user["user_id"], user["username"])
 
@@ -147,14 +189,13 @@ class AuthService:
     @staticmethod
     async def login_user(login_data: UserLogin) -> Dict[str, Any]:
 
-        users = db.execute(
+        users = await database.fetch(
             """
             SELECT user_id, username, email, password_hash, full_name
             FROM users
             WHERE username = %s
             """,
-            (login_data.username,),
-            fetch=True
+            (login_data.username,)
         )
 
         if not users:
@@ -165,13 +206,13 @@ class AuthService:
 
         user = users[0]
 
-        if not verify_password(login_data.password, user["password_hash"]):
+        if not await verify_password_async(login_data.password, user["password_hash"]):
             raise HTTPException(
                 status_code=401,
                 detail="Invalid username or password"
             )
 
-        db.execute(
+        await database.execute(
             "UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE user_id = %s",
             (user["user_id"],)
         )
@@ -194,14 +235,13 @@ class AuthService:
     @staticmethod
     async def get_user_profile(user_id: int) -> Dict[str, Any]:
 
-        users = db.execute(
+        users = await database.fetch(
             """
             SELECT user_id, username, email, full_name, created_at, last_login
             FROM users
             WHERE user_id = %s
             """,
-            (user_id,),
-            fetch=True
+            (user_id,)
         )
 
         if not users:
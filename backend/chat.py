@@ -0,0 +1,236 @@
+import asyncio
+import json
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel
+
+from async_db import database
+from auth import get_current_user
+from llm_queue import llm_queue
+from llm_registry import get_llm
+
+# --------------------------------------------------
+# CONFIG
+# --------------------------------------------------
+# Model, Ollama URL and keep-alive come from llm_registry (project root),
+# the same settings the Streamlit app uses.
+
+CHAT_HISTORY_MESSAGES = int(os.getenv("CHAT_HISTORY_MESSAGES", "20"))
+
+
+class ChatMessage(BaseModel):
+    role: str = "user"
+    message: str
+
+
+def sse_event(name: str, data: Dict[str, Any]) -> str:
+    return f"event: {name}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def messages_response(request: Request, rows: List[Dict[str, Any]]) -> Response:
+    """
+    Message list with a weak ETag (count and last message id; messages are
+    append-only), or 304 when the client already has it.
+    """
+    etag = f'W/"{len(rows)}-{rows[-1]["message_id"] if rows else 0}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if etag in (tag.strip() for tag in request.headers.get("if-none-match", "").split(",")):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(jsonable_encoder(rows), headers=headers)
+
+
+# --------------------------------------------------
+# CHAT SERVICE
+# --------------------------------------------------
+# Messages are read with a cursor (message_id) so clients only download
+# what they have not seen yet. An index on
+# interview_messages (interview_id, message_id) keeps this constant-time
+# per turn however long the interview gets.
+
+class ChatService:
+
+    # -------------------------
+    # MESSAGES
+    # -------------------------
+    @staticmethod
+    async def get_messages(
+        interview_id: int,
+        user_id: int,
+        after: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+
+        return await database.fetch(
+            """
+            SELECT m.message_id, m.role, m.message, m.created_at
+            FROM interview_messages m
+            JOIN interviews i ON i.interview_id = m.interview_id
+            WHERE m.interview_id = %s
+              AND i.user_id = %s
+              AND m.message_id > %s
+            ORDER BY m.message_id
+            """,
+            (interview_id, user_id, after or 0)
+        )
+
+    @staticmethod
+    async def add_message(interview_id: int, role: str, message: str) -> Dict[str, Any]:
+
+        return await database.fetchrow(
+            """
+            INSERT INTO interview_messages (interview_id, role, message)
+            VALUES (%s, %s, %s)
+            RETURNING message_id, role, message, created_at
+            """,
+            (interview_id, role, message)
+        )
+
+    @staticmethod
+    async def get_interview(interview_id: int, user_id: int) -> Dict[str, Any]:
+
+        interview = await database.fetchrow(
+            """
+            SELECT interview_id, company, role, interview_type, skills
+            FROM interviews
+            WHERE interview_id = %s AND user_id = %s
+            """,
+            (interview_id, user_id)
+        )
+
+        if not interview:
+            raise HTTPException(status_code=404, detail="Interview not found")
+
+        return interview
+
+    # -------------------------
+    # STREAMING REPLY
+    # -------------------------
+    @staticmethod
+    def _prompt(interview: Dict[str, Any], history: List[Dict[str, Any]]) -> List[tuple]:
+        system_prompt = f"""
+You are a professional, friendly human interviewer.
+- Speak naturally and conversationally.
+- Ask ONE question at a time, following on from the candidate's last answer.
+- Keep questions clear, concise and relevant to the role and skills.
+
+Interview Context:
+- Company: {interview['company']}
+- Role: {interview['role']}
+- Interview Type: {interview['interview_type']}
+- Candidate Skills: {interview['skills']}
+"""
+        messages = [("system", system_prompt)]
+        for msg in history[-CHAT_HISTORY_MESSAGES:]:
+            messages.append(("human" if msg["role"] == "user" else "ai", msg["message"]))
+        return messages
+
+    @staticmethod
+    async def reply(interview: Dict[str, Any], user_id: int, message: str) -> Dict[str, Any]:
+        """Non-streaming turn (the frontend's fallback), queued like the stream."""
+        interview_id = interview["interview_id"]
+
+        await ChatService.add_message(interview_id, "user", message)
+        history = await ChatService.get_messages(interview_id, user_id)
+
+        answer = await llm_queue.run(
+            user_id,
+            get_llm("interviewer", temperature=0.7).ainvoke,
+            ChatService._prompt(interview, history)
+        )
+        return await ChatService.add_message(interview_id, "assistant", answer.content)
+
+    @staticmethod
+    async def stream_reply(
+        interview: Dict[str, Any],
+        user_id: int,
+        message: str,
+        position: int
+    ) -> AsyncIterator[str]:
+        """
+        Server-sent events for one interview turn:
+        `queued` (if waiting), `token` per chunk, then `done` or `error`.
+        The reply is stored exactly once, even if the client disconnects
+        part-way through.
+        """
+        event = sse_event
+        interview_id = interview["interview_id"]
+        reply = ""
+        saved = False
+
+        await ChatService.add_message(interview_id, "user", message)
+        history = await ChatService.get_messages(interview_id, user_id)
+
+        if position:
+            yield event("queued", {"position": position})
+
+        try:
+            async with llm_queue.slot(user_id):
+                async for chunk in get_llm("interviewer", temperature=0.7).astream(ChatService._prompt(interview, history)):
+                    if chunk.content:
+                        reply += chunk.content
+                        yield event("token", {"token": chunk.content})
+
+            stored = await ChatService.add_message(interview_id, "assistant", reply)
+            saved = True
+            yield event("done", stored)
+
+        except HTTPException as e:
+            yield event("error", {"status": e.status_code, "detail": e.detail})
+
+        except Exception as e:
+            print("STREAM ERROR:", e)
+            yield event("error", {"status": 500, "detail": "Reply generation failed"})
+
+        finally:
+            # client went away mid-stream: keep what was generated
+            if reply and not saved:
+                await asyncio.shield(ChatService.add_message(interview_id, "assistant", reply))
+
+
+# --------------------------------------------------
+# ROUTES
+# --------------------------------------------------
+
+router = APIRouter()
+
+
+@router.get("/interviews/{interview_id}/chat")
+async def get_chat(
+    request: Request,
+    interview_id: int,
+    after: Optional[int] = None,
+    user: Dict[str, Any] = Depends(get_current_user)
+) -> Response:
+    return messages_response(request, await ChatService.get_messages(interview_id, user["user_id"], after))
+
+
+@router.post("/interviews/{interview_id}/chat")
+async def chat(
+    interview_id: int,
+    body: ChatMessage,
+    user: Dict[str, Any] = Depends(get_current_user)
+) -> Dict[str, Any]:
+    interview = await ChatService.get_interview(interview_id, user["user_id"])
+    return await ChatService.reply(interview, user["user_id"], body.message)
+
+
+@router.post("/interviews/{interview_id}/chat/stream")
+async def stream_chat(
+    interview_id: int,
+    body: ChatMessage,
+    user: Dict[str, Any] = Depends(get_current_user)
+) -> StreamingResponse:
+    interview = await ChatService.get_interview(interview_id, user["user_id"])
+
+    # reject with a real status code before the stream starts
+    position = llm_queue.admit(user["user_id"])
+
+    return StreamingResponse(
+        ChatService.stream_reply(interview, user["user_id"], body.message, position),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,219 @@
+import asyncio
+import inspect
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Deque, Dict
+
+from fastapi import APIRouter, HTTPException, status
+
+# --------------------------------------------------
+# CONFIG
+# --------------------------------------------------
+
+LLM_QUEUE_WORKERS = int(os.getenv("LLM_QUEUE_WORKERS", "2"))
+LLM_QUEUE_MAX_DEPTH = int(os.getenv("LLM_QUEUE_MAX_DEPTH", "50"))
+LLM_QUEUE_MAX_PER_USER = int(os.getenv("LLM_QUEUE_MAX_PER_USER", "3"))
+
+
+# --------------------------------------------------
+# JOB QUEUE
+# --------------------------------------------------
+
+class LLMJobQueue:
+    """
+    Bounded-concurrency gate in front of all LLM work.
+
+    At most `workers` generations run at once. Waiting jobs are queued per
+    user and released round-robin, so one busy user cannot starve others.
+    When the queue is full the request is rejected with its would-be
+    queue position instead of piling more load onto Ollama.
+    """
+
+    def __init__(
+        self,
+        workers: int = LLM_QUEUE_WORKERS,
+        max_depth: int = LLM_QUEUE_MAX_DEPTH,
+        max_per_user: int = LLM_QUEUE_MAX_PER_USER
+    ):
+        self.workers = workers
+        self.max_depth = max_depth
+        self.max_per_user = max_per_user
+
+        self._running = 0
+        self._depth = 0
+        self._waiting: "OrderedDict[Any, Deque[asyncio.Future]]" = OrderedDict()
+
+        self._wait_times: Deque[float] = deque(maxlen=1000)
+        self._run_times: Deque[float] = deque(maxlen=1000)
+        self._counters = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0}
+
+    # -------------------------
+    # POSITION
+    # -------------------------
+    def position(self, user_id: Any) -> int:
+        """
+        Queue position a new job from `user_id` would get.
+        With round-robin release, every other user is served at most once
+        per job this user already has waiting.
+        """
+        own = len(self._waiting.get(user_id, ()))
+        ahead = sum(
+            min(len(jobs), own + 1)
+            for uid, jobs in self._waiting.items()
+            if uid != user_id
+        )
+        return ahead + own + 1
+
+    def _retry_after(self, position: int) -> int:
+        avg_run = (sum(self._run_times) / len(self._run_times)) if self._run_times else 5.0
+        return max(1, int(avg_run * position / max(self.workers, 1)))
+
+    def _reject(self, code: int, message: str, position: int):
+        self._counters["rejected"] += 1
+        raise HTTPException(
+            status_code=code,
+            detail={
+                "message": message,
+                "queue_position": position,
+                "queue_depth": self._depth
+            },
+            headers={"Retry-After": str(self._retry_after(position))}
+        )
+
+    # -------------------------
+    # ACQUIRE / RELEASE
+    # -------------------------
+    def admit(self, user_id: Any) -> int:
+        """
+        Check a job from `user_id` would be accepted, raising the 503/429
+        rejection if not. Returns its queue position, or 0 if a worker is
+        free right now. Lets streaming routes reject before the response
+        has started.
+        """
+        if self._running < self.workers and self._depth == 0:
+            return 0
+
+        position = self.position(user_id)
+
+        if self._depth >= self.max_depth:
+            self._reject(
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                "The interviewer is busy. Please try again shortly.",
+                position
+            )
+
+        if len(self._waiting.get(user_id, ())) >= self.max_per_user:
+            self._reject(
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                "Too many pending requests for this user.",
+                position
+            )
+
+        return position
+
+    async def _acquire(self, user_id: Any) -> None:
+        if self.admit(user_id) == 0:
+            self._running += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(user_id, deque()).append(future)
+        self._depth += 1
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # slot was handed over just as we were cancelled
+                self._release()
+            else:
+                jobs = self._waiting.get(user_id)
+                if jobs and future in jobs:
+                    jobs.remove(future)
+                    self._depth -= 1
+                    if not jobs:
+                        del self._waiting[user_id]
+            raise
+
+    def _release(self) -> None:
+        # hand the slot straight to the next user in round-robin order
+        while self._waiting:
+            user_id, jobs = self._waiting.popitem(last=False)
+            future = jobs.popleft()
+            self._depth -= 1
+            if jobs:
+                self._waiting[user_id] = jobs
+            if not future.done():
+                future.set_result(None)
+                return
+        self._running -= 1
+
+    @asynccontextmanager
+    async def slot(self, user_id: Any):
+        """Hold one worker slot for the duration of the block."""
+        self._counters["submitted"] += 1
+        queued_at = time.perf_counter()
+
+        await self._acquire(user_id)
+
+        started = time.perf_counter()
+        self._wait_times.append(started - queued_at)
+        try:
+            yield
+            self._counters["completed"] += 1
+        except Exception:
+            self._counters["failed"] += 1
+            raise
+        finally:
+            self._run_times.append(time.perf_counter() - started)
+            self._release()
+
+    async def run(self, user_id: Any, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run an LLM call through the queue.
+        Blocking callables are moved to a thread so they don't stall the loop.
+        """
+        async with self.slot(user_id):
+            if inspect.iscoroutinefunction(fn):
+                return await fn(*args, **kwargs)
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+    # -------------------------
+    # METRICS
+    # -------------------------
+    def metrics(self) -> Dict[str, Any]:
+        waits = sorted(self._wait_times)
+
+        def pct(p: float) -> float:
+            return waits[min(len(waits) - 1, int(p * len(waits)))] if waits else 0.0
+
+        return {
+            "workers": self.workers,
+            "running": self._running,
+            "queue_depth": self._depth,
+            "max_depth": self.max_depth,
+            "waiting_users": len(self._waiting),
+            **self._counters,
+            "wait_seconds": {
+                "p50": pct(0.50),
+                "p95": pct(0.95),
+                "max": waits[-1] if waits else 0.0
+            }
+        }
+
+
+llm_queue = LLMJobQueue()
+
+
+# --------------------------------------------------
+# ROUTES
+# --------------------------------------------------
+
+router = APIRouter()
+
+
+@router.get("/llm/queue")
+async def queue_metrics() -> Dict[str, Any]:
+    return llm_queue.metrics()
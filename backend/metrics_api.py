@@ -0,0 +1,36 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+# the metrics registry and LLM callback are shared with the Streamlit app
+# in the project root, which must be on the import path alongside backend/
+# (as for chat.py's llm_registry), e.g. from the project root:
+#   PYTHONPATH=. uvicorn main:app --app-dir backend
+from metrics import CONTENT_TYPE, register_stats, registry
+
+from async_db import database
+from auth import token_cache
+from llm_queue import llm_queue
+from passwords import password_metrics
+
+# --------------------------------------------------
+# COLLECTORS
+# --------------------------------------------------
+# The hot paths already keep their own counters and timings; they are read
+# at scrape time instead of being recorded twice.
+
+register_stats("backend_db_statement", database.metrics, label="statement")
+register_stats("backend_auth_token_cache", token_cache.metrics)
+register_stats("backend_llm_queue", llm_queue.metrics)
+register_stats("backend_password", password_metrics)
+
+
+# --------------------------------------------------
+# ROUTES
+# --------------------------------------------------
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
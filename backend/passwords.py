@@ -0,0 +1,153 @@
+import asyncio
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Deque, Dict
+
+import bcrypt
+from fastapi import HTTPException
+
+from metrics import span
+
+# --------------------------------------------------
+# CONFIG
+# --------------------------------------------------
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_EXECUTOR = os.getenv("PASSWORD_EXECUTOR", "thread")  # "thread" or "process"
+PASSWORD_MAX_PENDING = int(os.getenv("PASSWORD_MAX_PENDING", str(PASSWORD_WORKERS * 8)))
+PASSWORD_QUEUE_TIMEOUT = float(os.getenv("PASSWORD_QUEUE_TIMEOUT", "10"))
+
+
+# --------------------------------------------------
+# BCRYPT PRIMITIVES
+# --------------------------------------------------
+# Module-level so they can be shipped to a process pool.
+
+def _hashpw(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+
+
+def _checkpw(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+# --------------------------------------------------
+# PASSWORD UTILS
+# --------------------------------------------------
+
+def _check_length(password: str) -> None:
+    if len(password) > 72:
+        raise HTTPException(
+            status_code=400,
+            detail="Password cannot exceed 72 characters"
+        )
+
+
+def hash_password(password: str) -> str:
+    _check_length(password)
+    return _hashpw(password.encode("utf-8"), BCRYPT_ROUNDS).decode("utf-8")
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    try:
+        return _checkpw(
+            plain_password.encode("utf-8"),
+            hashed_password.encode("utf-8")
+        )
+    except Exception:
+        return False
+
+
+# --------------------------------------------------
+# EXECUTOR
+# --------------------------------------------------
+# bcrypt is deliberately slow; running it inline blocks the event loop
+# for every other request. bcrypt releases the GIL, so threads scale
+# across cores; a process pool is available for interpreters where it
+# does not.
+
+_executor: Executor = None
+_pending: asyncio.Semaphore = None
+_timings: Dict[str, Deque[float]] = {"hash": deque(maxlen=1000), "verify": deque(maxlen=1000)}
+_counts: Dict[str, int] = {"hash": 0, "verify": 0, "rejected": 0}
+
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        if PASSWORD_EXECUTOR == "process":
+            _executor = ProcessPoolExecutor(max_workers=PASSWORD_WORKERS)
+        else:
+            _executor = ThreadPoolExecutor(
+                max_workers=PASSWORD_WORKERS,
+                thread_name_prefix="bcrypt"
+            )
+    return _executor
+
+
+async def _run(op: str, fn, *args) -> Any:
+    global _pending
+    if _pending is None:
+        _pending = asyncio.Semaphore(PASSWORD_MAX_PENDING)
+
+    # spans time the wait for a slot too; rejections and failures are "error"
+    with span(f"password_{op}"):
+        # bound work handed to the executor; a login burst waits for a slot
+        # and is only turned away if none frees up within PASSWORD_QUEUE_TIMEOUT
+        try:
+            await asyncio.wait_for(_pending.acquire(), PASSWORD_QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            _counts["rejected"] += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Server is busy, please try again",
+                headers={"Retry-After": "1"}
+            )
+
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(_get_executor(), fn, *args)
+        finally:
+            _pending.release()
+            _timings[op].append(time.perf_counter() - started)
+            _counts[op] += 1
+
+
+async def hash_password_async(password: str) -> str:
+    _check_length(password)
+    hashed = await _run("hash", _hashpw, password.encode("utf-8"), BCRYPT_ROUNDS)
+    return hashed.decode("utf-8")
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    try:
+        return await _run(
+            "verify",
+            _checkpw,
+            plain_password.encode("utf-8"),
+            hashed_password.encode("utf-8")
+        )
+    except ValueError:
+        # malformed stored hash
+        return False
+
+
+def password_metrics() -> Dict[str, Any]:
+    """Count and latency summary (seconds) of password operations."""
+    result = {
+        "rounds": BCRYPT_ROUNDS,
+        "workers": PASSWORD_WORKERS,
+        "executor": PASSWORD_EXECUTOR,
+        "rejected": _counts["rejected"]
+    }
+    for op, samples in _timings.items():
+        ordered = sorted(samples)
+        result[op] = {
+            "count": _counts[op],
+            "avg": sum(ordered) / len(ordered) if ordered else 0.0,
+            "p99": ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))] if ordered else 0.0
+        }
+    return result
@@ -0,0 +1,173 @@
+import asyncio
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel
+
+from async_db import database
+from auth import get_current_user
+from chat import messages_response, sse_event
+from llm_queue import llm_queue
+from llm_registry import get_llm
+from support_router import SUPPORT_SYSTEM_PROMPT, route_support_message
+
+# --------------------------------------------------
+# CONFIG
+# --------------------------------------------------
+
+SUPPORT_HISTORY_MESSAGES = int(os.getenv("SUPPORT_HISTORY_MESSAGES", "10"))
+
+# the backend can't start an interview for the user, only point the way
+START_INTERVIEW_REPLY = "You can start a new interview from the Interviews page with \"Create Interview\"."
+
+
+class SupportMessage(BaseModel):
+    message: str
+
+
+# --------------------------------------------------
+# SUPPORT SERVICE
+# --------------------------------------------------
+# Same routing as the Streamlit support chat: canned intents are answered
+# without the model; everything else goes through llm_queue, so support
+# replies share the interview chat's concurrency bound and fairness.
+
+class SupportService:
+
+    @staticmethod
+    async def get_messages(user_id: int) -> List[Dict[str, Any]]:
+
+        return await database.fetch(
+            """
+            SELECT message_id, role, message, created_at
+            FROM support_messages
+            WHERE user_id = %s
+            ORDER BY message_id
+            """,
+            (user_id,)
+        )
+
+    @staticmethod
+    async def add_message(user_id: int, role: str, message: str) -> Dict[str, Any]:
+
+        return await database.fetchrow(
+            """
+            INSERT INTO support_messages (user_id, role, message)
+            VALUES (%s, %s, %s)
+            RETURNING message_id, role, message, created_at
+            """,
+            (user_id, role, message)
+        )
+
+    @staticmethod
+    def canned_reply(message: str) -> Optional[str]:
+        decision = route_support_message(message)
+        if decision["intent"] == "start_interview":
+            return START_INTERVIEW_REPLY
+        return decision["reply"]
+
+    @staticmethod
+    def _prompt(history: List[Dict[str, Any]]) -> List[tuple]:
+        messages = [("system", SUPPORT_SYSTEM_PROMPT)]
+        for msg in history[-SUPPORT_HISTORY_MESSAGES:]:
+            messages.append(("human" if msg["role"] == "user" else "ai", msg["message"]))
+        return messages
+
+    @staticmethod
+    async def reply(user_id: int, message: str) -> Dict[str, Any]:
+
+        await SupportService.add_message(user_id, "user", message)
+
+        answer = SupportService.canned_reply(message)
+        if answer is None:
+            history = await SupportService.get_messages(user_id)
+            result = await llm_queue.run(
+                user_id,
+                get_llm("support", temperature=0.4).ainvoke,
+                SupportService._prompt(history)
+            )
+            answer = result.content.strip()
+
+        return await SupportService.add_message(user_id, "assistant", answer)
+
+    @staticmethod
+    async def stream_reply(
+        user_id: int,
+        message: str,
+        canned: Optional[str],
+        position: int
+    ) -> AsyncIterator[str]:
+        """Server-sent events, as ChatService.stream_reply."""
+        reply = ""
+        saved = False
+
+        await SupportService.add_message(user_id, "user", message)
+
+        if position:
+            yield sse_event("queued", {"position": position})
+
+        try:
+            if canned is not None:
+                reply = canned
+                yield sse_event("token", {"token": canned})
+            else:
+                history = await SupportService.get_messages(user_id)
+                async with llm_queue.slot(user_id):
+                    async for chunk in get_llm("support", temperature=0.4).astream(SupportService._prompt(history)):
+                        if chunk.content:
+                            reply += chunk.content
+                            yield sse_event("token", {"token": chunk.content})
+
+            stored = await SupportService.add_message(user_id, "assistant", reply.strip())
+            saved = True
+            yield sse_event("done", stored)
+
+        except HTTPException as e:
+            yield sse_event("error", {"status": e.status_code, "detail": e.detail})
+
+        except Exception as e:
+            print("SUPPORT STREAM ERROR:", e)
+            yield sse_event("error", {"status": 500, "detail": "Reply generation failed"})
+
+        finally:
+            if reply and not saved:
+                await asyncio.shield(SupportService.add_message(user_id, "assistant", reply.strip()))
+
+
+# --------------------------------------------------
+# ROUTES
+# --------------------------------------------------
+
+router = APIRouter()
+
+
+@router.get("/support/chats")
+async def get_support(request: Request, user: Dict[str, Any] = Depends(get_current_user)) -> Response:
+    return messages_response(request, await SupportService.get_messages(user["user_id"]))
+
+
+@router.post("/support/chats")
+async def support_chat(
+    body: SupportMessage,
+    user: Dict[str, Any] = Depends(get_current_user)
+) -> Dict[str, Any]:
+    return await SupportService.reply(user["user_id"], body.message)
+
+
+@router.post("/support/chats/stream")
+async def stream_support(
+    body: SupportMessage,
+    user: Dict[str, Any] = Depends(get_current_user)
+) -> StreamingResponse:
+    canned = SupportService.canned_reply(body.message)
+
+    # only model replies take a queue slot; reject before the stream starts
+    position = llm_queue.admit(user["user_id"]) if canned is None else 0
+
+    return StreamingResponse(
+        SupportService.stream_reply(user["user_id"], body.message, canned, position),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,331 @@
+"""
+Load test for /auth/register, /auth/login and /auth/profile.
+
+Replays a weighted mix of the three calls from a growing number of
+concurrent clients (closed loop: each client sends its next request as
+soon as the last one returns) and reports, per concurrency level and
+endpoint, throughput, p50/p95/p99 latency and error rate.
+
+By default the requests go in-process (httpx ASGITransport) to a FastAPI
+app that mounts AuthService on the same paths the frontend calls, backed
+by a temporary SQLite database through backend/async_db.py. Use
+--base-url to drive a running backend instead.
+
+    python benchmarks/bench_auth_load.py
+    python benchmarks/bench_auth_load.py --mix register=1,login=8,profile=4 --concurrency 10 50 100
+    python benchmarks/bench_auth_load.py --bcrypt-rounds 10 --pool-size 20 --password-workers 8
+    python benchmarks/bench_auth_load.py --password-max-pending 64
+    python benchmarks/bench_auth_load.py --base-url http://localhost:8000 --duration 30
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import types
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PASSWORD = "load-test-password"
+
+# seed registrations turned away with 503 (password executor busy) are retried
+SEED_RETRIES = 5
+
+# morning peak: mostly logins and profile loads, few sign-ups
+DEFAULT_MIX = "register=1,login=6,profile=3"
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT UNIQUE NOT NULL,
+    email TEXT UNIQUE NOT NULL,
+    password_hash TEXT NOT NULL,
+    full_name TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_login TIMESTAMP
+)
+"""
+
+
+# --------------------------------------------------
+# IN-PROCESS APP
+# --------------------------------------------------
+
+def _ensure_models():
+    """
+    backend/auth.py imports UserCreate/UserLogin from `models`, which is
+    not in the tree; fall back to request models with the fields
+    AuthService reads (and the frontend sends).
+    """
+    try:
+        import models  # noqa: F401
+        return
+    except ImportError:
+        pass
+
+    from typing import Optional
+    from pydantic import BaseModel
+
+    class UserCreate(BaseModel):
+        username: str
+        email: str
+        password: str
+        full_name: Optional[str] = None
+
+    class UserLogin(BaseModel):
+        username: str
+        password: str
+
+    module = types.ModuleType("models")
+    module.UserCreate = UserCreate
+    module.UserLogin = UserLogin
+    sys.modules["models"] = module
+    print("note: backend models.py not found, using stand-in UserCreate/UserLogin")
+
+
+def build_app():
+    """FastAPI app exposing AuthService on the frontend's /auth paths."""
+    # backend modules, and the project root for the shared metrics module
+    sys.path[:0] = [os.path.join(ROOT, "backend"), ROOT]
+    _ensure_models()
+
+    from fastapi import Depends, FastAPI
+    from models import UserCreate, UserLogin
+    from auth import AuthService, get_current_user
+
+    app = FastAPI()
+
+    @app.post("/auth/register")
+    async def register(body: UserCreate):
+        return await AuthService.register_user(body)
+
+    @app.post("/auth/login")
+    async def login(body: UserLogin):
+        return await AuthService.login_user(body)
+
+    @app.get("/auth/profile")
+    async def profile(user=Depends(get_current_user)):
+        return await AuthService.get_user_profile(user["user_id"])
+
+    return app
+
+
+# --------------------------------------------------
+# CLIENT
+# --------------------------------------------------
+
+class Users:
+    """Accounts created during the run, for login and profile calls."""
+
+    def __init__(self):
+        self.accounts = []  # (username, token)
+
+    def new_name(self):
+        return f"load_{uuid.uuid4().hex[:12]}"
+
+    def add(self, username, token):
+        self.accounts.append((username, token))
+
+    def pick(self):
+        return random.choice(self.accounts)
+
+
+async def call(client, users, endpoint):
+    """One request; returns (status, latency seconds). Status 0: transport error."""
+    started = time.perf_counter()
+    try:
+        if endpoint == "register":
+            name = users.new_name()
+            response = await client.post("/auth/register", json={
+                "username": name,
+                "email": f"{name}@example.com",
+                "password": PASSWORD,
+                "full_name": "Load Test"
+            })
+            if response.status_code == 200:
+                users.add(name, response.json()["token"])
+        elif endpoint == "login":
+            name, _ = users.pick()
+            response = await client.post("/auth/login", json={"username": name, "password": PASSWORD})
+        else:
+            _, token = users.pick()
+            response = await client.get("/auth/profile", headers={"Authorization": f"Bearer {token}"})
+        status = response.status_code
+    except Exception as e:
+        print(f"  {endpoint} failed: {type(e).__name__}: {e}")
+        status = 0
+    return status, time.perf_counter() - started
+
+
+async def seed(client, users, count, concurrency):
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with gate:
+            for attempt in range(SEED_RETRIES):
+                status, latency = await call(client, users, "register")
+                if status != 503:
+                    break
+                await asyncio.sleep(1 + attempt)
+            return status, latency
+
+    results = await asyncio.gather(*(one() for _ in range(count)))
+    failed = sum(1 for status, _ in results if status != 200)
+    if not users.accounts:
+        raise SystemExit(f"seeding failed: none of {count} registrations succeeded")
+    if failed:
+        print(f"  {failed} of {count} seed registrations failed")
+
+
+async def run_level(client, users, mix, concurrency, duration):
+    """Closed loop for `duration` seconds; {endpoint: [(status, latency)]}."""
+    endpoints, weights = zip(*mix.items())
+    results = {endpoint: [] for endpoint in endpoints}
+    deadline = time.perf_counter() + duration
+
+    async def client_loop():
+        while time.perf_counter() < deadline:
+            endpoint = random.choices(endpoints, weights)[0]
+            results[endpoint].append(await call(client, users, endpoint))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    return results, time.perf_counter() - started
+
+
+# --------------------------------------------------
+# REPORT
+# --------------------------------------------------
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))] if ordered else 0.0
+
+
+def summarize(samples, elapsed):
+    latencies = [latency for _, latency in samples]
+    errors = [status for status, _ in samples if not 200 <= status < 300]
+    return {
+        "requests": len(samples),
+        "rps": len(samples) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "error_rate": len(errors) / len(samples) if samples else 0.0,
+        "errors_by_status": {str(s): errors.count(s) for s in sorted(set(errors))}
+    }
+
+
+def print_level(concurrency, rows):
+    print(f"\nconcurrency {concurrency}")
+    print(f"  {'endpoint':<9} {'requests':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for endpoint, row in rows.items():
+        statuses = " ".join(f"{s}x{n}" for s, n in row["errors_by_status"].items())
+        print(f"  {endpoint:<9} {row['requests']:>8} {row['rps']:>8.1f} {row['p50_ms']:>8.1f} "
+              f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['error_rate']:>6.1%}  {statuses}".rstrip())
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        endpoint, _, weight = part.partition("=")
+        endpoint = endpoint.strip()
+        if endpoint not in ("register", "login", "profile"):
+            raise argparse.ArgumentTypeError(f"unknown endpoint {endpoint!r} in mix")
+        mix[endpoint] = float(weight or 1)
+    return {endpoint: weight for endpoint, weight in mix.items() if weight > 0}
+
+
+# --------------------------------------------------
+# MAIN
+# --------------------------------------------------
+
+async def run(args):
+    import httpx
+
+    database = None
+    if args.base_url:
+        transport = None
+        base_url = args.base_url
+    else:
+        app = build_app()
+        from async_db import database
+        # ASGITransport does not send lifespan events, so set up here
+        await database.connect()
+        if database.url.startswith("sqlite"):
+            await database.execute(SQLITE_SCHEMA)
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://auth-load-test"
+
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    report = {"mix": args.mix, "duration": args.duration, "levels": []}
+
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        users = Users()
+        print(f"seeding {args.users} users...")
+        await seed(client, users, args.users, min(args.users, 20))
+
+        for concurrency in args.concurrency:
+            results, elapsed = await run_level(client, users, args.mix, concurrency, args.duration)
+            rows = {endpoint: summarize(samples, elapsed) for endpoint, samples in results.items()}
+            rows["all"] = summarize([s for samples in results.values() for s in samples], elapsed)
+            print_level(concurrency, rows)
+            report["levels"].append({"concurrency": concurrency, "endpoints": rows})
+
+    if database is not None:
+        from passwords import password_metrics
+        report["passwords"] = password_metrics()
+        report["db"] = database.metrics()
+        await database.close()
+
+        pw = report["passwords"]
+        print(f"\nbcrypt rounds={pw['rounds']} workers={pw['workers']} ({pw['executor']}): "
+              f"hash p99 {pw['hash']['p99'] * 1000:.0f} ms, verify p99 {pw['verify']['p99'] * 1000:.0f} ms")
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="running backend to test (default: in-process app on SQLite)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"endpoint weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 5, 10, 25, 50],
+                        help="concurrent clients per level")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per level")
+    parser.add_argument("--users", type=int, default=50, help="accounts registered before the first level")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--json", help="also write the report to this file")
+    in_process = parser.add_argument_group("in-process app")
+    in_process.add_argument("--dsn", help="database URL (default: temporary SQLite file)")
+    in_process.add_argument("--bcrypt-rounds", type=int)
+    in_process.add_argument("--password-workers", type=int)
+    in_process.add_argument("--pool-size", type=int)
+    in_process.add_argument("--password-max-pending", type=int,
+                            help="PASSWORD_MAX_PENDING (default: the backend's, PASSWORD_WORKERS * 8)")
+    args = parser.parse_args()
+
+    # read by the backend modules at import time
+    os.environ["DATABASE_URL"] = args.dsn or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "auth.sqlite3")
+    for env, value in (("BCRYPT_ROUNDS", args.bcrypt_rounds),
+                       ("PASSWORD_WORKERS", args.password_workers),
+                       ("DB_POOL_MAX_SIZE", args.pool_size),
+                       ("PASSWORD_MAX_PENDING", args.password_max_pending)):
+        if value is not None:
+            os.environ[env] = str(value)
+
+    target = args.base_url or os.environ["DATABASE_URL"]
+    print(f"target={target} mix={args.mix} levels={args.concurrency} duration={args.duration}s")
+    report = asyncio.run(run(args))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Login throughput and latency with bcrypt inline vs. on the password executor.
+
+Simulates N concurrent logins inside one event loop, the way uvicorn runs
+AuthService.login_user, and measures per-login latency plus event-loop lag
+(how late a 10 ms heartbeat task wakes up while logins are in flight).
+
+    python benchmarks/bench_bcrypt.py --logins 200 --concurrency 50 --rounds 10
+    python benchmarks/bench_bcrypt.py --max-pending 8 --queue-timeout 2
+
+Logins the executor turns away (503 once no slot frees up within
+PASSWORD_QUEUE_TIMEOUT) are counted, not treated as failures of the run.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from fastapi import HTTPException
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))] if ordered else 0.0
+
+
+async def heartbeat(lags, stop):
+    while not stop.is_set():
+        expected = time.perf_counter() + 0.01
+        await asyncio.sleep(0.01)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def run(mode, passwords, stored_hash, logins, concurrency):
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+    rejected = []
+
+    async def login(arrived):
+        # latency is measured from arrival, so time spent queued behind
+        # other logins (or behind a blocked loop) counts
+        async with gate:
+            if mode == "blocking":
+                ok = passwords.verify_password("correct horse", stored_hash)
+            else:
+                try:
+                    ok = await passwords.verify_password_async("correct horse", stored_hash)
+                except HTTPException as e:
+                    if e.status_code != 503:
+                        raise
+                    rejected.append(time.perf_counter() - arrived)
+                    return
+            assert ok
+            latencies.append(time.perf_counter() - arrived)
+
+    lags, stop = [], asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lags, stop))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login(time.perf_counter()) for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await beat
+
+    return {
+        "mode": mode,
+        "throughput": len(latencies) / elapsed,
+        "rejected": len(rejected),
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "loop_lag_p99_ms": percentile(lags, 0.99) * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor")
+    parser.add_argument("--workers", type=int, default=None, help="password executor size")
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    parser.add_argument("--max-pending", type=int, default=None, help="PASSWORD_MAX_PENDING (default: backend's)")
+    parser.add_argument("--queue-timeout", type=float, default=None, help="PASSWORD_QUEUE_TIMEOUT seconds")
+    args = parser.parse_args()
+
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    os.environ["PASSWORD_EXECUTOR"] = args.executor
+    if args.workers:
+        os.environ["PASSWORD_WORKERS"] = str(args.workers)
+    if args.max_pending:
+        os.environ["PASSWORD_MAX_PENDING"] = str(args.max_pending)
+    if args.queue_timeout is not None:
+        os.environ["PASSWORD_QUEUE_TIMEOUT"] = str(args.queue_timeout)
+
+    # backend modules, and the project root for the shared metrics module
+    sys.path[:0] = [os.path.join(ROOT, "backend"), ROOT]
+    import passwords
+
+    stored_hash = passwords.hash_password("correct horse")
+
+    print(f"bcrypt rounds={args.rounds} workers={passwords.PASSWORD_WORKERS} "
+          f"executor={args.executor} max_pending={passwords.PASSWORD_MAX_PENDING} "
+          f"queue_timeout={passwords.PASSWORD_QUEUE_TIMEOUT}s logins={args.logins} concurrency={args.concurrency}")
+    print(f"{'mode':<10} {'logins/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'loop lag p99 ms':>16} {'503s':>6}")
+
+    for mode in ("blocking", "executor"):
+        result = asyncio.run(run(mode, passwords, stored_hash, args.logins, args.concurrency))
+        print(f"{result['mode']:<10} {result['throughput']:>10.1f} {result['p50_ms']:>10.1f} "
+              f"{result['p99_ms']:>10.1f} {result['loop_lag_p99_ms']:>16.1f} {result['rejected']:>6}")
+
+
+if __name__ == "__main__":
+    main()
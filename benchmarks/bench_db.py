@@ -0,0 +1,195 @@
+"""
+Register / login / profile query throughput: blocking db.execute vs. async_db.
+
+Runs the same statements AuthService issues, from N concurrent handlers in
+one event loop. The "blocking" path mimics the old synchronous
+db.execute(sql, params, fetch=True) called straight from async handlers;
+the "async" path goes through backend/async_db.py. Password hashing is left
+out so only database cost is measured (see bench_bcrypt.py for that).
+
+    python benchmarks/bench_db.py                       # SQLite stand-in
+    python benchmarks/bench_db.py --dsn postgresql://localhost/bench
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT UNIQUE NOT NULL,
+    email TEXT UNIQUE NOT NULL,
+    password_hash TEXT NOT NULL,
+    full_name TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_login TIMESTAMP
+)
+"""
+
+POSTGRES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id SERIAL PRIMARY KEY,
+    username TEXT UNIQUE NOT NULL,
+    email TEXT UNIQUE NOT NULL,
+    password_hash TEXT NOT NULL,
+    full_name TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_login TIMESTAMP
+)
+"""
+
+CHECK_USER = "SELECT user_id FROM users WHERE username = %s OR email = %s"
+INSERT_USER = """
+    INSERT INTO users (username, email, password_hash, full_name)
+    VALUES (%s, %s, %s, %s)
+    RETURNING user_id, username, email, full_name, created_at
+"""
+LOGIN_USER = """
+    SELECT user_id, username, email, password_hash, full_name
+    FROM users
+    WHERE username = %s
+"""
+TOUCH_LOGIN = "UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE user_id = %s"
+PROFILE = """
+    SELECT user_id, username, email, full_name, created_at, last_login
+    FROM users
+    WHERE user_id = %s
+"""
+
+
+# --------------------------------------------------
+# BLOCKING PATH (old db.execute)
+# --------------------------------------------------
+
+class BlockingDatabase:
+
+    def __init__(self, dsn):
+        if dsn.startswith("sqlite"):
+            import sqlite3
+            self.conn = sqlite3.connect(dsn.split("sqlite:///", 1)[-1], isolation_level=None)
+            self.conn.row_factory = sqlite3.Row
+            self.placeholder = "?"
+        else:
+            import psycopg2
+            import psycopg2.extras
+            self.conn = psycopg2.connect(dsn, cursor_factory=psycopg2.extras.RealDictCursor)
+            self.conn.autocommit = True
+            self.placeholder = "%s"
+
+    def execute(self, sql, params=(), fetch=False):
+        cursor = self.conn.cursor()
+        cursor.execute(sql.replace("%s", self.placeholder), params)
+        return [dict(row) for row in cursor.fetchall()] if fetch else None
+
+
+class BlockingAdapter:
+    """Gives the blocking db the async_db call shape, without yielding."""
+
+    def __init__(self, db):
+        self.db = db
+
+    async def fetch(self, sql, params=()):
+        return self.db.execute(sql, params, fetch=True)
+
+    async def execute(self, sql, params=()):
+        self.db.execute(sql, params)
+
+
+# --------------------------------------------------
+# FLOWS
+# --------------------------------------------------
+
+async def register(db, name):
+    await db.fetch(CHECK_USER, (name, f"{name}@example.com"))
+    rows = await db.fetch(INSERT_USER, (name, f"{name}@example.com", "x" * 60, name.title()))
+    return rows[0]["user_id"]
+
+
+async def login(db, name):
+    rows = await db.fetch(LOGIN_USER, (name,))
+    await db.execute(TOUCH_LOGIN, (rows[0]["user_id"],))
+
+
+async def profile(db, user_id):
+    await db.fetch(PROFILE, (user_id,))
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))] if ordered else 0.0
+
+
+async def measure(label, calls, concurrency):
+    gate = asyncio.Semaphore(concurrency)
+    lags, stop = [], asyncio.Event()
+
+    async def heartbeat():
+        while not stop.is_set():
+            expected = time.perf_counter() + 0.005
+            await asyncio.sleep(0.005)
+            lags.append(max(0.0, time.perf_counter() - expected))
+
+    async def guarded(call):
+        async with gate:
+            return await call()
+
+    beat = asyncio.create_task(heartbeat())
+    started = time.perf_counter()
+    results = await asyncio.gather(*(guarded(call) for call in calls))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await beat
+
+    print(f"  {label:<9} {len(calls) / elapsed:>10.0f} ops/s   loop lag p99 {percentile(lags, 0.99) * 1000:>7.1f} ms")
+    return results
+
+
+async def run(mode, db, ops, concurrency):
+    print(mode)
+    prefix = uuid.uuid4().hex[:8]
+    names = [f"{mode}_{prefix}_{i}" for i in range(ops)]
+    user_ids = await measure("register", [lambda n=n: register(db, n) for n in names], concurrency)
+    await measure("login", [lambda n=n: login(db, n) for n in names], concurrency)
+    await measure("profile", [lambda u=u: profile(db, u) for u in user_ids], concurrency)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", default=None, help="database URL (default: temporary SQLite file)")
+    parser.add_argument("--ops", type=int, default=2000, help="operations per endpoint")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--pool-size", type=int, default=10)
+    args = parser.parse_args()
+
+    dsn = args.dsn or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.sqlite3")
+    os.environ["DATABASE_URL"] = dsn
+    os.environ["DB_POOL_MAX_SIZE"] = str(args.pool_size)
+
+    # backend modules, and the project root for the shared metrics module
+    sys.path[:0] = [os.path.join(ROOT, "backend"), ROOT]
+    from async_db import AsyncDatabase
+
+    blocking = BlockingDatabase(dsn)
+    blocking.execute(SQLITE_SCHEMA if dsn.startswith("sqlite") else POSTGRES_SCHEMA)
+
+    print(f"dsn={dsn} ops={args.ops} concurrency={args.concurrency} pool={args.pool_size}")
+    asyncio.run(run("blocking", BlockingAdapter(blocking), args.ops, args.concurrency))
+
+    async def run_async():
+        db = AsyncDatabase(dsn)
+        try:
+            await run("async", db, args.ops, args.concurrency)
+        finally:
+            await db.close()
+
+    asyncio.run(run_async())
+
+
+if __name__ == "__main__":
+    main()
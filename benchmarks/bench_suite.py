@@ -0,0 +1,375 @@
+"""
+App overhead benchmarks against the fake Ollama server (fake_ollama.py).
+
+Every model call goes to a local stand-in with a fixed first-token delay
+and token rate, so the numbers move only when the app's own code does.
+Scenarios:
+
+  question_style  interviewer.extract_question_style, cold (style cache
+                  cleared) and warm; local question bank, no SerpAPI
+  interview       ask_question over N turns of one session: turn latency,
+                  time-to-first-token, prompt tokens sent per turn
+  feedback        generate_feedback, cold and cached
+  support         route_support_message + support_reply over a scripted
+                  conversation (canned, cached and LLM answers)
+  concurrency     N sessions taking turns at once: throughput, latency
+                  percentiles, time queued at the model server
+
+Results are written as JSON (benchmarks/results/<commit>.json by default);
+--compare prints the change against an earlier file.
+
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --turns 12 --concurrency 1 4 16
+    python benchmarks/bench_suite.py --compare benchmarks/results/abc1234.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_ollama import FakeOllama  # noqa: E402
+
+ANSWERS = [
+    "Yes, I'm ready.",
+    "I built a data pipeline in Python that processed about two million events a day.",
+    "We used Kafka for ingestion and wrote the consumers with asyncio.",
+    "The hardest part was making retries idempotent, so we keyed every write on the event id.",
+    "I would add better observability from the start, mostly tracing across services.",
+    "I usually start by reproducing the problem locally and writing a failing test.",
+    "In my last team I mentored two junior developers through their first releases.",
+    "I prefer small pull requests, they are easier to review and to roll back.",
+]
+
+SUPPORT_SCRIPT = [
+    "hi",
+    "How long does an interview last?",
+    "how long do interviews last",
+    "What are the stages of an interview?",
+    "Can I download my feedback?",
+    "what's the weather like today?",
+    "Can I download the feedback report?",
+    "thanks",
+]
+
+# one model name per role so the fake server's log tells them apart
+MODEL_ENV = {
+    "INTERVIEWER_MODEL": "fake-interviewer",
+    "QUESTION_STYLE_MODEL": "fake-question-style",
+    "SUMMARY_MODEL": "fake-summary",
+    "FEEDBACK_MODEL": "fake-feedback",
+    "SUPPORT_MODEL": "fake-support",
+}
+
+
+class NullPlaceholder:
+    """Stands in for st.empty(): rendering is not what is measured here."""
+
+    def markdown(self, *args, **kwargs):
+        pass
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))] if ordered else 0.0
+
+
+def new_record(n):
+    from interview_memory import RollingSummaryMemory
+
+    return {
+        "id": f"bench-{n}",
+        "memory": RollingSummaryMemory(),
+        "stage": "interview",
+        "candidate_name": "Alex",
+        "company": "Acme",
+        "role": "Backend Developer",
+        "type": "Technical",
+        "skills": "Python, SQL, Kafka",
+        "start_time": datetime.now(),
+        "question_style": "Start broad, then drill into design trade-offs and debugging.",
+        "feedback": None,
+        "prefetch": None,
+        "turn_timings": []
+    }
+
+
+def take_turn(interview, answer):
+    from interviewer import ask_question
+
+    started = time.perf_counter()
+    interview["memory"].chat_memory.add_user_message(answer)
+    ask_question(interview, answer, placeholder=NullPlaceholder())
+    return time.perf_counter() - started, interview["turn_timings"][-1]["time_to_first_token"]
+
+
+# scenarios
+def bench_question_style(server, runs):
+    from interviewer import extract_question_style
+    from style_cache import style_cache
+
+    cold, warm = [], []
+    for _ in range(runs):
+        style_cache.clear()
+        started = time.perf_counter()
+        extract_question_style("Backend Developer", "Python, SQL", "Technical")
+        cold.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        extract_question_style("Backend Developer", "Python, SQL", "Technical")
+        warm.append(time.perf_counter() - started)
+
+    return {"cold_p50_s": percentile(cold, 0.5), "warm_p50_s": percentile(warm, 0.5)}
+
+
+def bench_interview(server, turns):
+    interview = new_record(0)
+    interview["memory"].chat_memory.add_ai_message("Hello Alex, welcome to the technical interview. Are you ready to begin?")
+
+    rows = []
+    for turn in range(turns):
+        server.reset()
+        latency, ttft = take_turn(interview, ANSWERS[turn % len(ANSWERS)])
+        prompts = [r["prompt_tokens"] for r in server.requests if r["model"] == MODEL_ENV["INTERVIEWER_MODEL"]]
+        rows.append({
+            "turn": turn + 1,
+            "latency_s": latency,
+            "ttft_s": ttft,
+            "prompt_tokens": prompts[-1] if prompts else None
+        })
+
+    return {
+        "turns": rows,
+        "latency_p50_s": percentile([r["latency_s"] for r in rows], 0.5),
+        "ttft_p50_s": percentile([r["ttft_s"] for r in rows], 0.5),
+        "prompt_tokens_last": rows[-1]["prompt_tokens"] if rows else None,
+        "_interview": interview
+    }
+
+
+def bench_feedback(interview):
+    from interviewer import generate_feedback
+
+    started = time.perf_counter()
+    generate_feedback(interview)
+    cold = time.perf_counter() - started
+
+    started = time.perf_counter()
+    generate_feedback(interview)
+    cached = time.perf_counter() - started
+
+    return {"cold_s": cold, "cached_s": cached}
+
+
+def bench_support():
+    from semantic_cache import support_cache
+    from support_router import route_support_message
+    from support_chatbot import support_reply
+
+    support_cache.invalidate()
+
+    # the script is played as two users' chats: the second user's opening
+    # question (after a canned greeting) is answered from the shared cache,
+    # follow-ups within a chat always go to the model
+    rows = []
+    for chat in (1, 2):
+        session = SimpleNamespace(support_messages=[], support_window_start=0)
+        for question in SUPPORT_SCRIPT:
+            hits_before = support_cache.hits
+            started = time.perf_counter()
+
+            session.support_messages.append({"role": "user", "content": question})
+            decision = route_support_message(question)
+            answer = decision["reply"] or support_reply(session)
+            session.support_messages.append({"role": "assistant", "content": answer})
+
+            source = "canned" if decision["reply"] else ("cache" if support_cache.hits > hits_before else "llm")
+            rows.append({"chat": chat, "question": question, "source": source,
+                         "latency_s": time.perf_counter() - started})
+
+    llm = [r["latency_s"] for r in rows if r["source"] == "llm"]
+    fast = [r["latency_s"] for r in rows if r["source"] != "llm"]
+    return {
+        "messages": rows,
+        "llm_p50_s": percentile(llm, 0.5),
+        "canned_or_cached_p50_s": percentile(fast, 0.5)
+    }
+
+
+def bench_concurrency(server, sessions, turns):
+    server.reset()
+    latencies, ttfts, errors = [], [], []
+    lock = threading.Lock()
+
+    def session(n):
+        interview = new_record(n)
+        interview["memory"].chat_memory.add_ai_message("Hello Alex, are you ready to begin?")
+        for turn in range(turns):
+            try:
+                latency, ttft = take_turn(interview, ANSWERS[(n + turn) % len(ANSWERS)])
+            except Exception as e:
+                with lock:
+                    errors.append(repr(e))
+                continue
+            with lock:
+                latencies.append(latency)
+                ttfts.append(ttft)
+
+    threads = [threading.Thread(target=session, args=(n,)) for n in range(sessions)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    queued = [r["queued_s"] for r in server.requests if r["model"] == MODEL_ENV["INTERVIEWER_MODEL"]]
+    return {
+        "sessions": sessions,
+        "turns_per_s": len(latencies) / elapsed,
+        "latency_p50_s": percentile(latencies, 0.5),
+        "latency_p95_s": percentile(latencies, 0.95),
+        "ttft_p50_s": percentile(ttfts, 0.5),
+        "ttft_p95_s": percentile(ttfts, 0.95),
+        "queued_p95_s": percentile(queued, 0.95),
+        "errors": len(errors)
+    }
+
+
+# results
+def headline(results):
+    """Flat scalar metrics used for --compare."""
+    flat = {
+        "question_style.cold_p50_s": results["question_style"]["cold_p50_s"],
+        "question_style.warm_p50_s": results["question_style"]["warm_p50_s"],
+        "interview.latency_p50_s": results["interview"]["latency_p50_s"],
+        "interview.ttft_p50_s": results["interview"]["ttft_p50_s"],
+        "interview.prompt_tokens_last": results["interview"]["prompt_tokens_last"],
+        "feedback.cold_s": results["feedback"]["cold_s"],
+        "feedback.cached_s": results["feedback"]["cached_s"],
+        "support.llm_p50_s": results["support"]["llm_p50_s"],
+        "support.canned_or_cached_p50_s": results["support"]["canned_or_cached_p50_s"],
+    }
+    for row in results["concurrency"]:
+        for key in ("turns_per_s", "latency_p95_s", "ttft_p95_s"):
+            flat[f"concurrency.{row['sessions']}.{key}"] = row[key]
+    return flat
+
+
+def commit_id():
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+        return sha + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(previous, previous_path, current):
+    old, new = headline(previous["results"]), headline(current["results"])
+    print(f"\ncompared with {previous['commit']} ({previous_path})")
+    print(f"{'metric':<40} {'before':>10} {'after':>10} {'change':>8}")
+    for key, value in new.items():
+        before = old.get(key)
+        if before is None or value is None:
+            continue
+        change = f"{(value - before) / before * 100:+.0f}%" if before else ""
+        print(f"{key:<40} {before:>10.4f} {value:>10.4f} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=10, help="turns per interview session")
+    parser.add_argument("--style-runs", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--first-token-delay", type=float, default=0.05)
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--reply-tokens", type=int, default=40)
+    parser.add_argument("--parallel", type=int, default=4, help="fake server generation slots")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    # read before this run's results can overwrite it (same commit)
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+
+    server = FakeOllama(first_token_delay=args.first_token_delay, tokens_per_second=args.tokens_per_second,
+                        reply_tokens=args.reply_tokens, parallel=args.parallel)
+    url = server.start()
+
+    # configure the app before it is imported: fake server, scratch caches, no web search
+    scratch = tempfile.mkdtemp(prefix="bench-suite-")
+    os.environ.update(MODEL_ENV)
+    os.environ.update({
+        "OLLAMA_BASE_URL": url,
+        "STYLE_CACHE_PATH": os.path.join(scratch, "style.sqlite3"),
+        "INTERVIEW_DB_PATH": os.path.join(scratch, "interviews.sqlite3"),
+        "RETRIEVAL_BACKEND": "local",
+        "SERPAPI_API_KEY": "unused-by-benchmark"
+    })
+    sys.path.insert(0, ROOT)
+
+    print(f"fake ollama {url}: first token {args.first_token_delay * 1000:.0f} ms, "
+          f"{args.tokens_per_second:.0f} tok/s, {args.reply_tokens} tokens/reply, {args.parallel} slots")
+
+    results = {"question_style": bench_question_style(server, args.style_runs)}
+    print(f"question_style  cold p50 {results['question_style']['cold_p50_s'] * 1000:.1f} ms, "
+          f"warm p50 {results['question_style']['warm_p50_s'] * 1000:.2f} ms")
+
+    interview = bench_interview(server, args.turns)
+    finished_interview = interview.pop("_interview")
+    results["interview"] = interview
+    print(f"{'turn':>4} {'latency ms':>10} {'ttft ms':>8} {'prompt tok':>10}")
+    for row in interview["turns"]:
+        print(f"{row['turn']:>4} {row['latency_s'] * 1000:>10.1f} {row['ttft_s'] * 1000:>8.1f} {row['prompt_tokens'] or 0:>10}")
+
+    results["feedback"] = bench_feedback(finished_interview)
+    print(f"feedback        cold {results['feedback']['cold_s'] * 1000:.1f} ms, "
+          f"cached {results['feedback']['cached_s'] * 1000:.2f} ms")
+
+    results["support"] = bench_support()
+    print(f"support         llm p50 {results['support']['llm_p50_s'] * 1000:.1f} ms, "
+          f"canned/cached p50 {results['support']['canned_or_cached_p50_s'] * 1000:.2f} ms")
+
+    results["concurrency"] = []
+    print(f"{'sessions':>8} {'turns/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'ttft p95':>9} {'queued p95':>10} {'errors':>6}")
+    for sessions in args.concurrency:
+        row = bench_concurrency(server, sessions, args.turns)
+        results["concurrency"].append(row)
+        print(f"{sessions:>8} {row['turns_per_s']:>8.1f} {row['latency_p50_s'] * 1000:>8.0f} "
+              f"{row['latency_p95_s'] * 1000:>8.0f} {row['ttft_p95_s'] * 1000:>9.0f} "
+              f"{row['queued_p95_s'] * 1000:>10.0f} {row['errors']:>6}")
+
+    server.stop()
+
+    report = {
+        "commit": commit_id(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "results": results
+    }
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nresults written to {output}")
+
+    if previous:
+        compare(previous, args.compare, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Per-turn support chat latency as the conversation grows.
+
+Replays the same scripted conversation twice against Ollama:
+
+  string    the old layout: system prompt + every message flattened into
+            one string, resent in full each turn
+  messages  support_chatbot.build_support_messages: fixed system message
+            plus a bounded, prefix-stable window of role-tagged messages
+
+For each turn it prints wall time plus Ollama's own prompt_eval_count and
+prompt_eval_duration, which show prompt growth and KV-cache prefix reuse
+(a reused prefix is not re-evaluated).
+
+    python benchmarks/bench_support_chat.py --turns 30
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QUESTIONS = [
+    "How long does an interview last?",
+    "How do I start a new interview?",
+    "What are the stages of an interview?",
+    "Can I choose a behavioral interview instead of a technical one?",
+    "Where do I see my feedback after the interview?",
+    "Can I download the feedback report?",
+    "What happens when the timer runs out?",
+    "Can I delete an old interview?",
+    "Does the interviewer adapt to my skills?",
+    "Can I use the support chat during an interview?",
+]
+
+
+def string_layout(history):
+    from support_chatbot import SUPPORT_SYSTEM_PROMPT
+
+    conversation = SUPPORT_SYSTEM_PROMPT + "\n\n"
+    for msg in history:
+        conversation += f"{msg['role'].upper()}: {msg['content']}\n"
+    return conversation
+
+
+def run(layout, llm, turns):
+    from support_chatbot import build_support_messages
+
+    history, window_start, rows = [], 0, []
+
+    for turn in range(turns):
+        history.append({"role": "user", "content": QUESTIONS[turn % len(QUESTIONS)]})
+
+        if layout == "string":
+            request = string_layout(history)
+        else:
+            request, window_start = build_support_messages(history, window_start)
+
+        started = time.perf_counter()
+        response = llm.invoke(request)
+        elapsed = time.perf_counter() - started
+
+        meta = response.response_metadata
+        rows.append({
+            "turn": turn + 1,
+            "seconds": elapsed,
+            "prompt_tokens": meta.get("prompt_eval_count") or 0,
+            "prompt_eval_ms": (meta.get("prompt_eval_duration") or 0) / 1e6
+        })
+        history.append({"role": "assistant", "content": response.content.strip()})
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--max-tokens", type=int, default=64, help="cap on reply length (num_predict)")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    os.environ.setdefault("SERPAPI_API_KEY", "unused-by-benchmark")
+    from llm_registry import get_llm
+
+    llm = get_llm("support", temperature=0, num_predict=args.max_tokens)
+
+    results = {layout: run(layout, llm, args.turns) for layout in ("string", "messages")}
+
+    print(f"{'turn':>4} | {'string s':>8} {'tokens':>7} {'eval ms':>8} | {'messages s':>10} {'tokens':>7} {'eval ms':>8}")
+    for old, new in zip(results["string"], results["messages"]):
+        print(f"{old['turn']:>4} | {old['seconds']:>8.2f} {old['prompt_tokens']:>7} {old['prompt_eval_ms']:>8.0f} | "
+              f"{new['seconds']:>10.2f} {new['prompt_tokens']:>7} {new['prompt_eval_ms']:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Interview-stage rerun time as the transcript grows.
+
+Runs a minimal interview page under streamlit.testing (no browser) with a
+transcript of N messages and times warm reruns, as triggered by each
+keystroke/submit:
+
+  loop      the old rendering: isinstance + message_html + one st.markdown
+            per message, rebuilt on every rerun
+  fragment  transcript_view.render_transcript: newest page only, rendered
+            on each run as one markdown element
+
+    python benchmarks/bench_transcript.py --sizes 10 100 1000 --reruns 20
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGE = """
+import sys
+sys.path.insert(0, {root!r})
+import streamlit as st
+from langchain_core.messages import HumanMessage
+from interview_memory import TranscriptHistory
+from transcript_view import message_html, render_transcript
+
+class Memory:
+    def __init__(self, n):
+        self.chat_memory = TranscriptHistory()
+        for i in range(n):
+            if i % 2:
+                self.chat_memory.add_user_message(f"Answer {{i}}: " + "I worked on that project for two years. " * 4)
+            else:
+                self.chat_memory.add_ai_message(f"Question {{i}}: " + "Can you tell me more about how you approached it? " * 2)
+
+if "interview" not in st.session_state:
+    st.session_state.interview = {{"id": "bench", "memory": Memory({size})}}
+interview = st.session_state.interview
+
+with st.container(height=500):
+    if {mode!r} == "loop":
+        for msg in interview["memory"].chat_memory.messages:
+            role_type = "user" if isinstance(msg, HumanMessage) else "assistant"
+            st.markdown(message_html(role_type, msg.content), unsafe_allow_html=True)
+    else:
+        render_transcript(interview)
+
+st.chat_input("Type your answer here...")
+"""
+
+
+def measure(mode, size, reruns):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_string(PAGE.format(root=ROOT, size=size, mode=mode), default_timeout=120)
+    app.run()  # first run builds the transcript
+
+    samples = []
+    for _ in range(reruns):
+        started = time.perf_counter()
+        app.run()
+        samples.append(time.perf_counter() - started)
+
+    samples.sort()
+    return samples[len(samples) // 2], len(app.markdown)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ.setdefault("SERPAPI_API_KEY", "unused-by-benchmark")
+
+    print(f"{'messages':>8} | {'loop ms':>8} {'elements':>8} | {'fragment ms':>11} {'elements':>8} | {'speedup':>7}")
+    for size in args.sizes:
+        loop_s, loop_elements = measure("loop", size, args.reruns)
+        fragment_s, fragment_elements = measure("fragment", size, args.reruns)
+        print(f"{size:>8} | {loop_s * 1000:>8.1f} {loop_elements:>8} | {fragment_s * 1000:>11.1f} "
+              f"{fragment_elements:>8} | {loop_s / fragment_s:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Resident memory of interview transcripts held in session state.
+
+Builds many sessions' transcripts under tracemalloc and reports bytes per
+turn (one question + one answer) and the projection for 1,000 sessions:
+
+  messages  the old layout: a list of LangChain HumanMessage/AIMessage
+            objects (what ConversationBufferMemory keeps)
+  compact   interview_memory.TranscriptHistory: a role bytearray plus the
+            content strings
+
+Message text is the same in both, so the difference is per-message
+overhead. "overhead" excludes the text itself.
+
+    python benchmarks/bench_transcript_memory.py --sessions 200 --turns 30
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QUESTION = "Can you walk me through a project where you used {skill}, and what you would do differently now?"
+ANSWER = ("Sure. At my last job I used {skill} to rebuild our reporting pipeline. "
+          "It cut the nightly run from three hours to forty minutes, and I learned a lot about testing. ") * 2
+SKILLS = ["Python", "SQL", "Docker", "React", "Kubernetes", "Spark"]
+
+
+def conversation(session, turns):
+    for turn in range(turns):
+        skill = SKILLS[(session + turn) % len(SKILLS)]
+        # distinct strings per session, as real answers would be
+        yield QUESTION.format(skill=skill) + f" ({session}.{turn})", ANSWER.format(skill=skill) + f" ({session}.{turn})"
+
+
+def build(layout, sessions, turns):
+    from langchain_core.messages import HumanMessage, AIMessage
+    from interview_memory import TranscriptHistory
+
+    transcripts = []
+    for session in range(sessions):
+        if layout == "messages":
+            transcript = []
+            for question, answer in conversation(session, turns):
+                transcript.append(AIMessage(content=question))
+                transcript.append(HumanMessage(content=answer))
+        else:
+            transcript = TranscriptHistory()
+            for question, answer in conversation(session, turns):
+                transcript.add_ai_message(question)
+                transcript.add_user_message(answer)
+        transcripts.append(transcript)
+    return transcripts
+
+
+def measure(layout, sessions, turns):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    transcripts = build(layout, sessions, turns)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del transcripts
+    return used
+
+
+def text_bytes(sessions, turns):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    texts = [pair for session in range(sessions) for pair in conversation(session, turns)]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    # the list and tuples holding the strings are not part of either layout
+    return used - sys.getsizeof(texts) - len(texts) * sys.getsizeof((None, None))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=30, help="question + answer pairs per session")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    os.environ.setdefault("SERPAPI_API_KEY", "unused-by-benchmark")
+    # import outside the measured region
+    import interview_memory  # noqa: F401
+    import langchain_core.messages  # noqa: F401
+
+    total_turns = args.sessions * args.turns
+    text = text_bytes(args.sessions, args.turns)
+
+    print(f"sessions={args.sessions} turns/session={args.turns}  (text alone: {text / total_turns:,.0f} B/turn)")
+    print(f"{'layout':<9} | {'B/turn':>8} {'overhead B/turn':>15} | {'MB per 1,000 sessions':>21}")
+    for layout in ("messages", "compact"):
+        used = measure(layout, args.sessions, args.turns)
+        per_turn = used / total_turns
+        per_1000 = used / args.sessions * 1000 / 1e6
+        print(f"{layout:<9} | {per_turn:>8,.0f} {(used - text) / total_turns:>15,.0f} | {per_1000:>21,.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Stand-in Ollama server for benchmarks: speaks /api/chat, /api/generate,
+/api/tags, /api/show and /api/version, and streams deterministic replies
+at a fixed pace, so measurements show the app's own overhead rather than
+the model's.
+
+  --first-token-delay  seconds before the first token (prompt eval time)
+  --tokens-per-second  pace of the following tokens
+  --reply-tokens       tokens per reply
+  --parallel           requests generated at once; the rest queue, like
+                       OLLAMA_NUM_PARALLEL
+
+Prompt size is reported back as prompt_eval_count (~4 characters per
+token), and every request is logged for the benchmark to inspect.
+
+    python benchmarks/fake_ollama.py --port 11434 --tokens-per-second 40
+"""
+import argparse
+import hashlib
+import json
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = (
+    "that sounds like a solid approach could you walk me through how you "
+    "handled the trade offs and what you would change if you built it again "
+    "today with a larger team and tighter deadlines"
+).split()
+
+
+def reply_tokens(prompt, count):
+    """Same prompt, same reply: the start word is picked from a hash of the prompt."""
+    start = int.from_bytes(hashlib.sha256(prompt.encode("utf-8")).digest()[:4], "little") % len(WORDS)
+    tokens = [(" " if i else "") + WORDS[(start + i) % len(WORDS)] for i in range(count)]
+    if tokens:
+        tokens[-1] += "?"
+    return tokens
+
+
+class FakeOllama:
+    """
+    Threaded HTTP server; start() runs it in a background thread and
+    returns the base URL (port 0 picks a free port).
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, first_token_delay=0.05,
+                 tokens_per_second=50.0, reply_tokens=40, parallel=4):
+        self.first_token_delay = first_token_delay
+        self.tokens_per_second = tokens_per_second
+        self.reply_tokens = reply_tokens
+        self.requests = []  # {"path", "model", "prompt_tokens", "queued_s", "started", "finished"}
+        self._slots = threading.Semaphore(parallel)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-ollama", daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset(self):
+        with self._lock:
+            self.requests = []
+
+    def _record(self, entry):
+        with self._lock:
+            self.requests.append(entry)
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # like Ollama (Go sets TCP_NODELAY): no Nagle delay between streamed chunks
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def log_message(self, *args):
+                pass
+
+            def _json(self, body, status=200):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path == "/api/version":
+                    self._json({"version": "0.0.0-fake"})
+                elif self.path == "/api/tags":
+                    self._json({"models": [{"name": "fake:latest", "model": "fake:latest", "size": 0}]})
+                else:
+                    self._json({"error": "not found"}, 404)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+
+                if self.path == "/api/show":
+                    self._json({"modelfile": "", "parameters": "", "template": "", "details": {}})
+                elif self.path == "/api/chat":
+                    prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+                    self._generate(body, prompt, lambda token: {"message": {"role": "assistant", "content": token}})
+                elif self.path == "/api/generate":
+                    self._generate(body, body.get("prompt", ""), lambda token: {"response": token})
+                else:
+                    self._json({"error": "not found"}, 404)
+
+            def _generate(self, body, prompt, chunk):
+                model = body.get("model", "fake:latest")
+                prompt_tokens = len(prompt) // 4 + 1
+                tokens = reply_tokens(prompt, fake.reply_tokens)
+                arrived = time.perf_counter()
+
+                with fake._slots:
+                    started = time.perf_counter()
+
+                    def line(done, token="", **extra):
+                        return dict(
+                            model=model,
+                            created_at=datetime.now(timezone.utc).isoformat(),
+                            done=done,
+                            **chunk(token),
+                            **extra
+                        )
+
+                    time.sleep(fake.first_token_delay)
+                    interval = 1.0 / fake.tokens_per_second if fake.tokens_per_second > 0 else 0.0
+                    final = line(
+                        True,
+                        done_reason="stop",
+                        total_duration=0,
+                        load_duration=0,
+                        prompt_eval_count=prompt_tokens,
+                        prompt_eval_duration=int(fake.first_token_delay * 1e9),
+                        eval_count=len(tokens),
+                        eval_duration=int(interval * len(tokens) * 1e9)
+                    )
+
+                    if body.get("stream", True):
+                        self.send_response(200)
+                        self.send_header("Content-Type", "application/x-ndjson")
+                        self.send_header("Transfer-Encoding", "chunked")
+                        self.end_headers()
+
+                        def send(obj):
+                            data = (json.dumps(obj) + "\n").encode("utf-8")
+                            self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                            self.wfile.flush()
+
+                        for i, token in enumerate(tokens):
+                            if i:
+                                time.sleep(interval)
+                            send(line(False, token))
+                        final["total_duration"] = int((time.perf_counter() - started) * 1e9)
+                        send(final)
+                        self.wfile.write(b"0\r\n\r\n")
+                    else:
+                        time.sleep(interval * max(0, len(tokens) - 1))
+                        final.update(chunk("".join(tokens)))
+                        final["total_duration"] = int((time.perf_counter() - started) * 1e9)
+                        self._json(final)
+
+                fake._record({
+                    "path": self.path,
+                    "model": model,
+                    "prompt_tokens": prompt_tokens,
+                    "queued_s": started - arrived,
+                    "started": started,
+                    "finished": time.perf_counter()
+                })
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--first-token-delay", type=float, default=0.05)
+    parser.add_argument("--tokens-per-second", type=float, default=50.0)
+    parser.add_argument("--reply-tokens", type=int, default=40)
+    parser.add_argument("--parallel", type=int, default=4)
+    args = parser.parse_args()
+
+    server = FakeOllama(args.host, args.port, args.first_token_delay,
+                        args.tokens_per_second, args.reply_tokens, args.parallel)
+    print(f"fake ollama on {server.url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Cold-start import cost of the Streamlit entry points, with a budget.
+
+For each entry point, the script's top-level import statements run in a
+fresh interpreter under `python -X importtime`, a few times. The report
+shows the time spent above the `import streamlit` baseline (which every
+page pays anyway), and where that time goes per package and per
+first-party module.
+
+Exits non-zero if an entry point goes over --budget-ms, or if it imports
+a package that should only load on first use (--forbid).
+
+    python benchmarks/import_budget.py
+    python benchmarks/import_budget.py --budget-ms 100 --runs 5
+"""
+import argparse
+import ast
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = ["app.py", os.path.join("Ai_chatbot", "app.py")]
+
+# loaded on first LLM call / web search, never at startup
+LAZY_PACKAGES = [
+    "langchain_core", "langchain_ollama", "langchain_community", "langchain_classic",
+    "ollama", "aiohttp", "httpx"
+]
+
+IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def entry_imports(path):
+    """Source of the script's top-level import statements."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def profile(code, script_dir):
+    """[(module, self_us, cumulative_us, depth)] for one cold interpreter."""
+    env = dict(os.environ, SERPAPI_API_KEY=os.environ.get("SERPAPI_API_KEY", "unused-by-import-budget"))
+    setup = f"import sys; sys.path[:0] = [{script_dir!r}, {ROOT!r}]\n"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", setup + code],
+        capture_output=True, text=True, env=env, cwd=ROOT
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def total_ms(rows):
+    return sum(row[1] for row in rows) / 1000
+
+
+def median_profile(code, script_dir, runs):
+    profiles = [profile(code, script_dir) for _ in range(runs)]
+    totals = [total_ms(rows) for rows in profiles]
+    # keep the run closest to the median for the breakdown
+    median = statistics.median(totals)
+    return median, min(profiles, key=lambda rows: abs(total_ms(rows) - median))
+
+
+def first_party(module):
+    top = module.split(".")[0]
+    return os.path.exists(os.path.join(ROOT, top + ".py")) or os.path.isdir(os.path.join(ROOT, top))
+
+
+def report(name, total, baseline, rows, baseline_modules, top):
+    extra = [row for row in rows if row[0] not in baseline_modules]
+
+    by_package = {}
+    for module, self_us, _, _ in extra:
+        package = module.split(".")[0]
+        by_package[package] = by_package.get(package, 0) + self_us
+
+    print(f"\n{name}: {total:.0f} ms total, {total - baseline:.0f} ms above streamlit "
+          f"({len(extra)} extra modules)")
+    print("  heaviest packages (self time):")
+    for package, self_us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"    {self_us / 1000:>8.1f} ms  {package}")
+    print("  first-party modules (cumulative):")
+    for module, _, cumulative_us, _ in sorted(
+        (row for row in extra if first_party(row[0])), key=lambda row: row[2], reverse=True
+    )[:top]:
+        print(f"    {cumulative_us / 1000:>8.1f} ms  {module}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=150.0,
+                        help="max import time above the streamlit baseline (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=3, help="cold interpreters per measurement")
+    parser.add_argument("--top", type=int, default=8)
+    parser.add_argument("--forbid", nargs="*", default=LAZY_PACKAGES,
+                        help="packages that must not be imported at startup")
+    args = parser.parse_args()
+
+    baseline, baseline_rows = median_profile("import streamlit", ROOT, args.runs)
+    baseline_modules = {row[0] for row in baseline_rows}
+    print(f"baseline (import streamlit): {baseline:.0f} ms, budget {args.budget_ms:.0f} ms above it")
+
+    failures = []
+    for entry in ENTRY_POINTS:
+        path = os.path.join(ROOT, entry)
+        total, rows = median_profile(entry_imports(path), os.path.dirname(path), args.runs)
+        report(entry, total, baseline, rows, baseline_modules, args.top)
+
+        if total - baseline > args.budget_ms:
+            failures.append(f"{entry}: {total - baseline:.0f} ms above streamlit (budget {args.budget_ms:.0f} ms)")
+
+        loaded = sorted({row[0].split(".")[0] for row in rows} & set(args.forbid) - {
+            row[0].split(".")[0] for row in baseline_rows
+        })
+        if loaded:
+            failures.append(f"{entry}: imports {', '.join(loaded)} at startup")
+
+    if failures:
+        print("\nFAIL")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
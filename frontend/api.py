@@ -1,6 +1,69 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+from http.cookiejar import DefaultCookiePolicy
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+API_URL = os.getenv("API_URL", "http://localhost:8000")
+
+CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT", "120"))
+GET_RETRIES = int(os.getenv("API_GET_RETRIES", "3"))
+RETRY_BACKOFF = float(os.getenv("API_RETRY_BACKOFF", "0.3"))
+POOL_SIZE = int(os.getenv("API_POOL_SIZE", "20"))
+ETAG_CACHE_SIZE = int(os.getenv("API_ETAG_CACHE_SIZE", "512"))
+
+
+# ---------- HTTP CLIENT ----------
+def _make_session():
+    session = requests.Session()
+    # One session serves every Streamlit user, so never keep cookies
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    # Only idempotent GETs are retried; POSTs fail fast
+    retry = Retry(
+        total=GET_RETRIES,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_session = _make_session()
+
+
+class APIError(requests.HTTPError):
+    """
+    Error reply from the API, as a requests.HTTPError (what raise_for_status
+    gives). str() is the server's message; `status` and `retry_after` tell
+    a busy backend (429/503 from the LLM queue) from a real failure.
+    """
+
+    def __init__(self, status, detail, retry_after=None, response=None):
+        # the LLM queue sends {"message", "queue_position", ...} as detail
+        message = detail.get("message", "Request failed") if isinstance(detail, dict) else str(detail)
+        super().__init__(message, response=response)
+        self.status = status
+        self.detail = detail
+        self.retry_after = int(retry_after) if str(retry_after or "").isdigit() else None
+
+    @property
+    def busy(self):
+        return self.status in (429, 503)
+
+# (url, params, token) -> (etag, payload) for conditional GETs
+_etag_cache = OrderedDict()
+_etag_lock = threading.Lock()
 
-API_URL = "http://localhost:8000"
 
 def _headers(token=None):
     h = {"Content-Type": "application/json"}
@@ -9,61 +72,155 @@ def _headers(token=None):
     return h
 
 
+def _get(path, token=None, params=None):
+    url = f"{API_URL}{path}"
+    key = (url, tuple(sorted((params or {}).items())), token)
+    headers = _headers(token)
+
+    # only revalidate when there is a body to fall back on
+    with _etag_lock:
+        cached = _etag_cache.get(key)
+    if cached is not None:
+        headers["If-None-Match"] = cached[0]
+
+    res = _session.get(url, headers=headers, params=params, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+
+    if res.status_code == 304:
+        if cached is not None:
+            with _etag_lock:
+                if key in _etag_cache:
+                    _etag_cache.move_to_end(key)
+            return cached[1]
+
+        # 304 without a cached body (e.g. from a proxy): ask again unconditionally
+        headers.pop("If-None-Match", None)
+        headers["Cache-Control"] = "no-cache"
+        res = _session.get(url, headers=headers, params=params, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+
+    payload = res.json()
+
+    etag = res.headers.get("ETag")
+    if etag and res.ok:
+        with _etag_lock:
+            _etag_cache[key] = (etag, payload)
+            _etag_cache.move_to_end(key)
+            while len(_etag_cache) > ETAG_CACHE_SIZE:
+                _etag_cache.popitem(last=False)
+
+    return payload
+
+
+def _post(path, token=None, json=None):
+    return _session.post(
+        f"{API_URL}{path}",
+        json=json,
+        headers=_headers(token),
+        timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+    ).json()
+
+
+def _stream(path, token, json_body, fallback_path, on_event=None):
+    """
+    POST and yield reply tokens from a server-sent-events response.
+    Non-token events (e.g. `queued`) go to `on_event(name, data)`.
+    Falls back to the non-streaming endpoint if the server lacks one.
+    """
+    headers = _headers(token)
+    headers["Accept"] = "text/event-stream"
+
+    with _session.post(
+        f"{API_URL}{path}",
+        json=json_body,
+        headers=headers,
+        stream=True,
+        timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+    ) as res:
+        if res.status_code in (404, 405):
+            yield _post(fallback_path, token, json=json_body).get("message", "")
+            return
+
+        if not res.ok:
+            try:
+                detail = res.json().get("detail", "Request failed")
+            except ValueError:
+                detail = res.reason or "Request failed"
+            raise APIError(res.status_code, detail, res.headers.get("Retry-After"), response=res)
+
+        name, data = "message", []
+        for line in res.iter_lines(decode_unicode=True):
+            if line:
+                if line.startswith("event:"):
+                    name = line[6:].strip()
+                elif line.startswith("data:"):
+                    data.append(line[5:].lstrip())
+                continue
+
+            # blank line ends an event
+            payload = json.loads("\n".join(data)) if data else {}
+            if name == "token":
+                yield payload["token"]
+            elif name == "error":
+                raise APIError(payload.get("status", 500), payload.get("detail", "Streaming failed"), response=res)
+            elif on_event:
+                on_event(name, payload)
+            name, data = "message", []
+
+
 # ---------- AUTH ----------
 def register(data):
-    return requests.post(f"{API_URL}/auth/register", json=data).json()
+    return _post("/auth/register", json=data)
 
 def login(data):
-    return requests.post(f"{API_URL}/auth/login", json=data).json()
+    return _post("/auth/login", json=data)
 
 def profile(token):
-    return requests.get(f"{API_URL}/auth/profile", headers=_headers(token)).json()
+    return _get("/auth/profile", token)
 
 
 # ---------- INTERVIEWS ----------
 def create_interview(token, data):
-    return requests.post(
-        f"{API_URL}/interviews",
-        json=data,
-        headers=_headers(token)
-    ).json()
+    return _post("/interviews", token, json=data)
 
 def get_interviews(token):
-    return requests.get(
-        f"{API_URL}/interviews",
-        headers=_headers(token)
-    ).json()
+    return _get("/interviews", token)
 
 def start_interview(token, interview_id):
-    return requests.post(
-        f"{API_URL}/interviews/{interview_id}/start",
-        headers=_headers(token)
-    ).json()
+    return _post(f"/interviews/{interview_id}/start", token)
 
 def interview_chat(token, interview_id, message):
-    return requests.post(
-        f"{API_URL}/interviews/{interview_id}/chat",
-        json={"role": "user", "message": message},
-        headers=_headers(token)
-    ).json()
+    return _post(
+        f"/interviews/{interview_id}/chat",
+        token,
+        json={"role": "user", "message": message}
+    )
 
-def get_chat(token, interview_id):
-    return requests.get(
-        f"{API_URL}/interviews/{interview_id}/chat",
-        headers=_headers(token)
-    ).json()
+def interview_chat_stream(token, interview_id, message, on_event=None):
+    return _stream(
+        f"/interviews/{interview_id}/chat/stream",
+        token,
+        {"role": "user", "message": message},
+        f"/interviews/{interview_id}/chat",
+        on_event
+    )
+
+def get_chat(token, interview_id, after=None):
+    # `after` is the last message_id the caller already has
+    params = {"after": after} if after is not None else None
+    return _get(f"/interviews/{interview_id}/chat", token, params=params)
 
 
 # ---------- SUPPORT ----------
 def support_chat(token, message):
-    return requests.post(
-        f"{API_URL}/support/chats",
-        json={"message": message},
-        headers=_headers(token)
-    ).json()
+    return _post("/support/chats", token, json={"message": message})
+
+def support_chat_stream(token, message, on_event=None):
+    return _stream(
+        "/support/chats/stream",
+        token,
+        {"message": message},
+        "/support/chats",
+        on_event
+    )
 
 def get_support(token):
-    return requests.get(
-        f"{API_URL}/support/chats",
-        headers=_headers(token)
-    ).json()
+    return _get("/support/chats", token)
\ No newline at end of file
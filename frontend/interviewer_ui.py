@@ -1,9 +1,42 @@
 import streamlit as st
 from api import (
-    create_interview, get_interviews,
-    start_interview, interview_chat, get_chat
+    APIError, create_interview, get_interviews,
+    start_interview, interview_chat_stream, get_chat
 )
 
+def sync_chat(token, interview_id):
+    """
+    Keep a per-interview transcript in session state and only fetch
+    messages newer than the last one we have.
+    """
+    transcripts = st.session_state.setdefault("transcripts", {})
+    chat = transcripts.setdefault(interview_id, [])
+
+    after = chat[-1].get("message_id") if chat else None
+    new = get_chat(token, interview_id, after=after) or []
+
+    if after is None:
+        # first load, or a server that doesn't send message ids
+        chat[:] = new
+    else:
+        chat.extend(m for m in new if m.get("message_id", 0) > after)
+
+    return chat
+
+
+def show_queue_position(event, data):
+    if event == "queued":
+        st.toast(f"Waiting for the interviewer (position {data['position']})")
+
+
+def show_api_error(error):
+    if error.busy:
+        wait = f" in about {error.retry_after} seconds" if error.retry_after else " in a moment"
+        st.warning(f"The interviewer is busy right now. Please try again{wait}.")
+    else:
+        st.error(str(error))
+
+
 def interview_page(token):
     st.subheader("🎤 Interviews")
 
@@ -38,13 +71,22 @@ def interview_page(token):
             start_interview(token, interview["interview_id"])
             st.rerun()
 
-    chat = get_chat(token, interview["interview_id"]) or []
+    chat = sync_chat(token, interview["interview_id"])
 
     for msg in chat:
         st.chat_message(msg["role"]).write(msg["message"])
 
     prompt = st.chat_input("Your answer...")
     if prompt:
-        res = interview_chat(token, interview["interview_id"], prompt)
-        st.chat_message("assistant").write(res["message"])
+        st.chat_message("user").write(prompt)
+        try:
+            st.chat_message("assistant").write_stream(
+                interview_chat_stream(
+                    token, interview["interview_id"], prompt,
+                    on_event=show_queue_position
+                )
+            )
+        except APIError as e:
+            show_api_error(e)
+            return
         st.rerun()
@@ -1,5 +1,6 @@
 import streamlit as st
-from api import support_chat, get_support
+from api import APIError, support_chat_stream, get_support
+from interviewer_ui import show_api_error
 
 def support_page(token):
     st.subheader("🆘 Support")
@@ -10,6 +11,10 @@ def support_page(token):
 
     text = st.chat_input("Ask support...")
     if text:
-        res = support_chat(token, text)
-        st.chat_message("assistant").write(res["message"])
+        st.chat_message("user").write(text)
+        try:
+            st.chat_message("assistant").write_stream(support_chat_stream(token, text))
+        except APIError as e:
+            show_api_error(e)
+            return
         st.rerun()
@@ -0,0 +1,82 @@
+import os
+import heapq
+import threading
+from datetime import datetime, timedelta
+
+# interview length, shared by the countdown, the deadline and the greeting
+INTERVIEW_MINUTES = int(os.getenv("INTERVIEW_MINUTES", "15"))
+
+
+def interview_deadline(interview):
+    if not interview.get("start_time"):
+        return None
+    return interview["start_time"] + timedelta(minutes=INTERVIEW_MINUTES)
+
+
+def time_remaining(interview):
+    deadline = interview_deadline(interview)
+    if deadline is None:
+        return None
+    return max(timedelta(0), deadline - datetime.now())
+
+
+class DeadlineScheduler:
+    """
+    One background thread that moves interviews to the feedback stage
+    when their time runs out, whether or not the candidate is typing.
+    Deadlines sit in a heap; the thread sleeps until the earliest one.
+    """
+
+    def __init__(self):
+        self._heap = []  # (deadline, seq, interview_id)
+        self._interviews = {}
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def schedule(self, interview):
+        deadline = interview_deadline(interview)
+        if deadline is None:
+            return
+
+        with self._cond:
+            self._interviews[interview["id"]] = interview
+            self._seq += 1
+            heapq.heappush(self._heap, (deadline, self._seq, interview["id"]))
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="interview-deadlines", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def cancel(self, interview_id):
+        with self._cond:
+            self._interviews.pop(interview_id, None)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+
+                deadline, _, interview_id = self._heap[0]
+                wait = (deadline - datetime.now()).total_seconds()
+                if wait > 0:
+                    # woken early by a new, possibly earlier, deadline
+                    self._cond.wait(wait)
+                    continue
+
+                heapq.heappop(self._heap)
+                interview = self._interviews.get(interview_id)
+
+                # ignore entries superseded by a later schedule() of the same interview
+                if interview is None or interview_deadline(interview) != deadline:
+                    continue
+                del self._interviews[interview_id]
+
+            if interview.get("stage") == "interview":
+                interview["stage"] = "feedback"
+
+
+# one scheduler per server process
+deadline_scheduler = DeadlineScheduler()
@@ -0,0 +1,219 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from llm_registry import get_llm
+
+# memory configuration
+MEMORY_RECENT_TURNS = int(os.getenv("MEMORY_RECENT_TURNS", "4"))
+MEMORY_TOKEN_BUDGET = int(os.getenv("MEMORY_TOKEN_BUDGET", "1500"))
+
+# summaries are produced off the request path
+_summary_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="memory-summary")
+
+# transcript roles, stored as their index (one byte per message)
+ROLE_TYPES = ("human", "ai", "system")
+
+
+def to_message(role_type, content):
+    # langchain_core is only imported once a prompt is actually built
+    from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
+
+    classes = {"human": HumanMessage, "ai": AIMessage, "system": SystemMessage}
+    return classes[role_type](content=content)
+
+
+def estimate_tokens(text):
+    # ~4 characters per token is close enough for budgeting mistral prompts
+    return len(text) // 4 + 1
+
+
+def _truncate_tokens(text, tokens):
+    if tokens <= 0:
+        return ""
+    return text[-tokens * 4:] if estimate_tokens(text) > tokens else text
+
+
+class TranscriptHistory:
+    """
+    Full interview transcript, stored compactly: one role byte per message
+    plus the content strings. LangChain message objects are only built for
+    the slice that goes into a prompt; the app renders from turns() and
+    feedback hashes it. `on_add(role_type, content)` runs for every new
+    message (persistence, summaries).
+    """
+
+    def __init__(self, on_add=None):
+        self._roles = bytearray()
+        self._contents = []
+        self._on_add = on_add
+
+    def __len__(self):
+        return len(self._contents)
+
+    def turns(self, start=0, stop=None):
+        """(role_type, content) pairs, e.g. ("human", "...")."""
+        for i in range(start, len(self._contents) if stop is None else stop):
+            yield ROLE_TYPES[self._roles[i]], self._contents[i]
+
+    def content(self, index):
+        return self._contents[index]
+
+    def message(self, index):
+        return to_message(ROLE_TYPES[self._roles[index]], self._contents[index])
+
+    @property
+    def messages(self):
+        # materialises the whole transcript; prefer turns() or message()
+        return [self.message(i) for i in range(len(self._contents))]
+
+    def _add(self, role_type, content):
+        self._roles.append(ROLE_TYPES.index(role_type) if role_type in ROLE_TYPES else 1)
+        self._contents.append(content)
+        if self._on_add:
+            self._on_add(role_type, content)
+
+    def add_user_message(self, content):
+        self._add("human", content)
+
+    def add_ai_message(self, content):
+        self._add("ai", content)
+
+    def add_message(self, message):
+        self._add(message.type, message.content)
+
+    def restore(self, turns):
+        """Load stored (role_type, content) pairs without firing on_add."""
+        self.clear()
+        for role_type, content in turns:
+            self._roles.append(ROLE_TYPES.index(role_type) if role_type in ROLE_TYPES else 1)
+            self._contents.append(content)
+
+    def clear(self):
+        self._roles = bytearray()
+        self._contents = []
+
+
+class RollingSummaryMemory:
+    """
+    Drop-in replacement for ConversationBufferMemory(return_messages=True).
+    Keeps the last N turns verbatim plus a running summary of older turns,
+    and never returns more history than the token budget allows.
+    """
+
+    memory_key = "history"
+    return_messages = True
+
+    def __init__(self, recent_turns=MEMORY_RECENT_TURNS, token_budget=MEMORY_TOKEN_BUDGET, on_message=None):
+        self.recent_turns = recent_turns
+        self.token_budget = token_budget
+        self.chat_memory = TranscriptHistory(on_add=self._message_added)
+        self._on_message = on_message
+        self.summary = ""
+        self._summarized = 0  # messages already folded into the summary
+        self._pending = None
+        self._generation = 0  # bumped by clear(); older summaries are dropped
+        self._lock = threading.Lock()
+
+    @property
+    def memory_variables(self):
+        return [self.memory_key]
+
+    def _message_added(self, role_type, content):
+        if self._on_message:
+            self._on_message(role_type, content)
+        self._schedule_summary()
+
+    # summary maintenance
+    def _schedule_summary(self):
+        cutoff = len(self.chat_memory) - 2 * self.recent_turns
+
+        with self._lock:
+            if self._pending is not None or cutoff <= self._summarized:
+                return
+            try:
+                self._pending = _summary_executor.submit(
+                    self._summarize, self.summary, list(self.chat_memory.turns(self._summarized, cutoff)),
+                    cutoff, self._generation
+                )
+            except RuntimeError:
+                # process is shutting down; the transcript is already stored
+                return
+            self._pending.add_done_callback(self._summary_done)
+
+    def _summarize(self, previous, turns, upto, generation):
+        lines = "\n".join(
+            f"{'Candidate' if role_type == 'human' else 'Interviewer'}: {content}"
+            for role_type, content in turns
+        )
+        prompt = f"""
+Update the running summary of a job interview with the new lines below.
+Keep the topics covered, the questions already asked, and notable points
+from the candidate's answers. Be concise.
+
+Current summary:
+{previous or 'None yet.'}
+
+New lines:
+{lines}
+"""
+        llm = get_llm("summary", temperature=0)
+        return llm.invoke(prompt).content.strip(), upto, generation
+
+    def _summary_done(self, future):
+        with self._lock:
+            if self._pending is future:
+                self._pending = None
+            current = future.exception() is None and future.result()[2] == self._generation
+            if current:
+                self.summary, self._summarized, _ = future.result()
+        # more turns may have arrived while this summary was running
+        if current:
+            self._schedule_summary()
+
+    # memory interface
+    def load_memory_variables(self, inputs):
+        transcript = self.chat_memory
+        with self._lock:
+            summary, summarized = self.summary, self._summarized
+
+        budget = self.token_budget
+        history = []
+
+        if summary:
+            summary = _truncate_tokens(summary, budget // 3)
+            history.append(to_message("system", f"Summary of the earlier interview:\n{summary}"))
+            budget -= estimate_tokens(history[0].content)
+
+        # newest first, stopping once the budget is spent; messages that are
+        # not yet summarised still count against it. Only the messages that
+        # make it into the prompt are turned into LangChain objects.
+        first = len(transcript)
+        for index in range(len(transcript) - 1, summarized - 1, -1):
+            cost = estimate_tokens(transcript.content(index))
+            if cost > budget:
+                break
+            first = index
+            budget -= cost
+
+        if first == len(transcript) and first > summarized:
+            # even the newest message doesn't fit: send its tail
+            newest = transcript.message(first - 1)
+            recent = [newest.model_copy(update={"content": _truncate_tokens(newest.content, budget)})]
+        else:
+            recent = [transcript.message(i) for i in range(first, len(transcript))]
+
+        return {self.memory_key: history + recent}
+
+    def save_context(self, inputs, outputs):
+        self.chat_memory.add_user_message(next(iter(inputs.values())))
+        self.chat_memory.add_ai_message(next(iter(outputs.values())))
+
+    def clear(self):
+        with self._lock:
+            self.chat_memory.clear()
+            self.summary = ""
+            self._summarized = 0
+            # a summary still running describes the old transcript
+            self._generation += 1
+            self._pending = None
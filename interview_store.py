@@ -0,0 +1,200 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from datetime import datetime
+
+# store configuration
+INTERVIEW_DB_PATH = os.getenv(
+    "INTERVIEW_DB_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "interviews.sqlite3")
+)
+
+# record keys that live in the database; everything else on a record
+# (memory, prefetch job, timings) is rebuilt on load
+PERSISTED_FIELDS = frozenset([
+    "candidate_name", "company", "role", "type", "skills",
+    "stage", "start_time", "question_style", "feedback"
+])
+
+
+class StoredInterview(dict):
+    """
+    Interview record that writes persisted fields through to the store,
+    whoever changes them (the page, the prefetch worker, the deadline
+    scheduler).
+    """
+
+    def __init__(self, store, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._store = store
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        if key in PERSISTED_FIELDS:
+            self._store.save(self)
+
+    def update(self, *args, **kwargs):
+        changes = dict(*args, **kwargs)
+        super().update(changes)
+        if PERSISTED_FIELDS.intersection(changes):
+            self._store.save(self)
+
+
+class InterviewStore:
+    """
+    Durable interview metadata and transcripts in SQLite (WAL mode, shared
+    by every Streamlit worker). Messages are append-only rows, written as
+    they are added; the sidebar reads summaries without touching them.
+    """
+
+    def __init__(self, path=INTERVIEW_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._schema_ready = False
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            if not self._schema_ready:
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS interviews (
+                        id TEXT PRIMARY KEY,
+                        owner TEXT NOT NULL,
+                        candidate_name TEXT,
+                        company TEXT,
+                        role TEXT,
+                        type TEXT,
+                        skills TEXT,
+                        stage TEXT NOT NULL,
+                        start_time TEXT,
+                        question_style TEXT,
+                        feedback TEXT,
+                        created_at REAL NOT NULL,
+                        updated_at REAL NOT NULL
+                    );
+                    CREATE INDEX IF NOT EXISTS interviews_owner ON interviews (owner, created_at);
+                    CREATE TABLE IF NOT EXISTS messages (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        interview_id TEXT NOT NULL,
+                        role TEXT NOT NULL,
+                        content TEXT NOT NULL
+                    );
+                    CREATE INDEX IF NOT EXISTS messages_interview ON messages (interview_id, id);
+                """)
+                self._schema_ready = True
+        return conn
+
+    # interviews
+    def create(self, owner, record):
+        now = time.time()
+        interview = StoredInterview(self, record, owner=owner)
+        self._conn().execute(
+            "INSERT INTO interviews (id, owner, stage, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (interview["id"], owner, interview["stage"], now, now)
+        )
+        self.save(interview)
+        return interview
+
+    def save(self, interview):
+        start_time = interview.get("start_time")
+        feedback = interview.get("feedback")
+        self._conn().execute(
+            """
+            UPDATE interviews
+            SET candidate_name = ?, company = ?, role = ?, type = ?, skills = ?,
+                stage = ?, start_time = ?, question_style = ?, feedback = ?, updated_at = ?
+            WHERE id = ?
+            """,
+            (
+                interview.get("candidate_name"), interview.get("company"), interview.get("role"),
+                interview.get("type"), interview.get("skills"), interview["stage"],
+                start_time.isoformat() if start_time else None,
+                interview.get("question_style"),
+                json.dumps(feedback) if feedback else None,
+                time.time(), interview["id"]
+            )
+        )
+
+    def load(self, interview_id):
+        """Metadata only; the transcript comes from load_messages."""
+        conn = self._conn()
+        row = conn.execute(
+            """
+            SELECT id, owner, candidate_name, company, role, type, skills,
+                   stage, start_time, question_style, feedback
+            FROM interviews WHERE id = ?
+            """,
+            (interview_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        keys = ["id", "owner", "candidate_name", "company", "role", "type", "skills",
+                "stage", "start_time", "question_style", "feedback"]
+        record = {key: value if value is not None else "" for key, value in zip(keys, row)}
+        record["start_time"] = datetime.fromisoformat(row[8]) if row[8] else None
+        record["feedback"] = json.loads(row[10]) if row[10] else None
+        return StoredInterview(self, record)
+
+    def summaries(self, owner):
+        """Lightweight rows for the sidebar, oldest first."""
+        rows = self._conn().execute(
+            "SELECT id, company, role, stage FROM interviews WHERE owner = ? ORDER BY created_at",
+            (owner,)
+        ).fetchall()
+        return [{"id": r[0], "company": r[1], "role": r[2], "stage": r[3]} for r in rows]
+
+    def delete(self, interview_id):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM messages WHERE interview_id = ?", (interview_id,))
+            conn.execute("DELETE FROM interviews WHERE id = ?", (interview_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def purge(self, owner_prefix, older_than):
+        """
+        Delete interviews, with their transcripts, whose owner starts with
+        owner_prefix and that have not been saved since older_than (epoch
+        seconds). Returns how many were deleted.
+        """
+        stale = "SELECT id FROM interviews WHERE substr(owner, 1, ?) = ? AND updated_at < ?"
+        params = (len(owner_prefix), owner_prefix, older_than)
+
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(f"DELETE FROM messages WHERE interview_id IN ({stale})", params)
+            deleted = conn.execute(f"DELETE FROM interviews WHERE id IN ({stale})", params).rowcount
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return deleted
+
+    # transcript
+    def append_message(self, interview_id, role, content):
+        self._conn().execute(
+            "INSERT INTO messages (interview_id, role, content) VALUES (?, ?, ?)",
+            (interview_id, role, content)
+        )
+
+    def load_messages(self, interview_id):
+        """[(role, content)] in the order they were added."""
+        return self._conn().execute(
+            "SELECT role, content FROM messages WHERE interview_id = ? ORDER BY id",
+            (interview_id,)
+        ).fetchall()
+
+
+interview_store = InterviewStore()
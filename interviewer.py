@@ -1,30 +1,126 @@
 import uuid
-from datetime import datetime, timedelta
+import time
+import hashlib
+import threading
+from datetime import datetime
 import streamlit as st
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
-from langchain_ollama import ChatOllama
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.messages import HumanMessage
-from langchain_classic.memory import ConversationBufferMemory
-from langchain_community.utilities import SerpAPIWrapper
+from style_cache import style_cache
+from question_bank import RETRIEVAL_BACKEND, retrieve_context
+from interview_memory import RollingSummaryMemory
+from interview_deadlines import deadline_scheduler, interview_deadline
+from interview_store import interview_store
+from llm_registry import get_llm
+from metrics import cache_lookups, traced
 
-# Load environment variables
+# Load environment variables (cheap; LangChain and SerpAPI are imported on first use)
 load_dotenv()
 SERPAPI_API_KEY = os.getenv("SERPAPI_API_KEY")
 
-if not SERPAPI_API_KEY:
+# the key is only needed when web search is enabled
+if not SERPAPI_API_KEY and RETRIEVAL_BACKEND != "local":
     st.error("SERPAPI_API_KEY not found in .env")
     st.stop()
 
+# question style and first question are prepared here while the greeting is read
+_prefetch_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="interview-prefetch")
+
+# interviews kept loaded per browser session; the rest stay in the store
+INTERVIEW_CACHE_SIZE = int(os.getenv("INTERVIEW_CACHE_SIZE", "3"))
+INTERVIEW_IDLE_SECONDS = int(os.getenv("INTERVIEW_IDLE_SECONDS", "600"))
+
+# request header carrying the signed-in user when an auth proxy sits in front
+# of the app (e.g. X-Forwarded-User). Only set this if the proxy strips the
+# header from client requests; otherwise anyone can claim any owner.
+INTERVIEW_OWNER_HEADER = os.getenv("INTERVIEW_OWNER_HEADER", "")
+
+# anonymous interviews can never be reopened once their session ends, so
+# they are deleted after this long without changes (checked at most hourly)
+ANONYMOUS_RETENTION_HOURS = float(os.getenv("ANONYMOUS_INTERVIEW_RETENTION_HOURS", "24"))
+ANONYMOUS_OWNER_PREFIX = "session:"
+
+_last_purge = 0.0
+_purge_lock = threading.Lock()
+
 
 # interview management
+def _authenticated_owner():
+    """Owner id of the signed-in user, or None for anonymous visitors."""
+    if getattr(st.user, "is_logged_in", False):
+        identity = st.user.get("sub") or st.user.get("email")
+        if identity:
+            return f"user:{identity}"
+
+    if INTERVIEW_OWNER_HEADER:
+        identity = st.context.headers.get(INTERVIEW_OWNER_HEADER)
+        if identity:
+            return f"proxy:{identity}"
+
+    return None
+
+
+def _purge_anonymous():
+    global _last_purge
+    now = time.time()
+    with _purge_lock:
+        if now - _last_purge < 3600:
+            return
+        _last_purge = now
+
+    try:
+        interview_store.purge(ANONYMOUS_OWNER_PREFIX, now - ANONYMOUS_RETENTION_HOURS * 3600)
+    except Exception as e:
+        print("INTERVIEW PURGE ERROR:", e)
+
+
+def init_interviews(session_state):
+    """
+    Interviews are stored on disk under an owner id, and only that owner
+    can load them. The owner comes from a real identity: Streamlit's
+    st.login() user, or INTERVIEW_OWNER_HEADER from an auth proxy. Those
+    users find their interviews again after a reload or a server restart.
+    Persistence across restarts therefore needs an authenticated owner.
+    Anonymous visitors get an owner id that lives only in their session;
+    their interviews are stored while they use them, but nobody (including
+    them, after the session ends) can reopen them, so they are purged after
+    ANONYMOUS_INTERVIEW_RETENTION_HOURS. The id is never put in the URL.
+    session_state.interviews only holds the ones currently loaded.
+    """
+    if "interviews" not in session_state:
+        session_state.interviews = {}
+
+    if "active_interview_id" not in session_state:
+        session_state.active_interview_id = None
+
+    if "owner_id" not in session_state:
+        session_state.owner_id = _authenticated_owner() or f"{ANONYMOUS_OWNER_PREFIX}{uuid.uuid4().hex}"
+        _purge_anonymous()
+
+        # links from before owners left the URL must not keep granting access
+        if "owner" in st.query_params:
+            del st.query_params["owner"]
+
+
+def _new_memory(interview_id):
+    # every transcript message is appended to the store as it is added
+    return RollingSummaryMemory(
+        on_message=lambda role_type, content: interview_store.append_message(interview_id, role_type, content)
+    )
+
+
+def list_interviews(session_state):
+    """Sidebar summaries (id, company, role, stage); no transcripts are loaded."""
+    return interview_store.summaries(session_state.owner_id)
+
+
 def new_interview(session_state):
     interview_id = str(uuid.uuid4())
-    session_state.interviews[interview_id] = {
+    session_state.interviews[interview_id] = interview_store.create(session_state.owner_id, {
         "id": interview_id,
-        "memory": ConversationBufferMemory(return_messages=True),
+        "memory": _new_memory(interview_id),
         "stage": "setup",
         "candidate_name": "",
         "company": "",
@@ -32,46 +128,98 @@ def new_interview(session_state):
         "type": "",
         "skills": "",
         "start_time": None,
-        "question_style": ""
-    }
+        "question_style": "",
+        "feedback": None,
+        "prefetch": None,
+        "turn_timings": [],
+        "last_access": time.time()
+    })
     session_state.active_interview_id = interview_id
     st.rerun()
 
 
 def delete_interview(session_state, interview_id):
-    if interview_id in session_state.interviews:
-        del session_state.interviews[interview_id]
+    session_state.interviews.pop(interview_id, None)
+    interview_store.delete(interview_id)
+    deadline_scheduler.cancel(interview_id)
     session_state.active_interview_id = None
     st.rerun()
 
 
+def _load_interview(interview_id, owner):
+    interview = interview_store.load(interview_id)
+    if interview is None or interview["owner"] != owner:
+        return None
+
+    memory = _new_memory(interview_id)
+    memory.chat_memory.restore(interview_store.load_messages(interview_id))
+    interview.update({"memory": memory, "prefetch": None, "turn_timings": []})
+
+    # deadlines don't survive a restart; re-arm running interviews
+    if interview["stage"] == "interview":
+        deadline_scheduler.schedule(interview)
+    return interview
+
+
+def _evict_idle(session_state):
+    """
+    Drop loaded interviews other than the active one once they are idle or
+    over the per-session cap. They reload from the store when reopened.
+    """
+    now = time.time()
+    others = sorted(
+        ((interview.get("last_access", 0), iid)
+         for iid, interview in session_state.interviews.items()
+         if iid != session_state.active_interview_id),
+        reverse=True
+    )
+    for rank, (last_access, iid) in enumerate(others):
+        if rank >= INTERVIEW_CACHE_SIZE - 1 or now - last_access > INTERVIEW_IDLE_SECONDS:
+            del session_state.interviews[iid]
+
+
 def get_active(session_state):
     iid = session_state.active_interview_id
-    if not iid or iid not in session_state.interviews:
+    if not iid:
         return None
-    return session_state.interviews[iid]
+
+    interview = session_state.interviews.get(iid)
+    if interview is None:
+        # opened from the sidebar: load the transcript now
+        interview = _load_interview(iid, session_state.owner_id)
+        if interview is None:
+            return None
+        session_state.interviews[iid] = interview
+
+    interview["last_access"] = time.time()
+    _evict_idle(session_state)
+    return interview
 
 
 # question style building
-def build_question_style(interview):
+@traced("question_style")
+def extract_question_style(role, skills, interview_type):
     """
-    Run ONCE at interview start.
-    Extracts patterns, topics, and difficulty progression.
-    If web search fails, fallback to generic question style.
+    Extract patterns, topics, and difficulty progression for an interview.
+    Safe to call from a worker thread (no Streamlit calls).
+    Returns (style, grounded); grounded is False when retrieval found
+    nothing and a generic style was produced instead.
+    Grounding comes from the local question bank and/or SerpAPI, see
+    RETRIEVAL_BACKEND. Grounded results are cached on disk per (role, skills, type).
     """
-    search = SerpAPIWrapper(serpapi_api_key=SERPAPI_API_KEY)
-    query = f"{interview['role']} interview questions {interview['skills']} {interview['type']} interview"
+    cached = style_cache.get(role, skills, interview_type)
+    if cached is not None:
+        return cached, True
 
-    try:
-        raw_results = search.run(query)
-        if not raw_results:
-            raise ValueError("No search results")
-        raw_results = raw_results[:2000]
-    except Exception:
-        raw_results = ""
-        st.warning("⚠️ Web search failed. Using default question style.")
+    def web_search():
+        from langchain_community.utilities import SerpAPIWrapper
+
+        search = SerpAPIWrapper(serpapi_api_key=SERPAPI_API_KEY)
+        return search.run(f"{role} interview questions {skills} {interview_type} interview")
 
-    llm = ChatOllama(model="mistral:latest", temperature=0.3)
+    raw_results = retrieve_context(role, skills, interview_type, web_search=web_search, limit=2000)
+
+    llm = get_llm("question_style", temperature=0.3)
 
     # Prompt for extracting question style
     prompt = f"""
@@ -89,18 +237,91 @@ Text:
 {raw_results if raw_results else 'No search results available, use generic patterns for a human-like interview.'}
 """
 
+    style = llm.invoke(prompt).content
+
+    # Only cache styles grounded in real search results
+    if raw_results:
+        style_cache.set(role, skills, interview_type, style)
+
+    return style, bool(raw_results)
+
+
+def build_question_style(interview):
+    """
+    Run ONCE at interview start.
+    If retrieval finds nothing, fallback to generic question style.
+    """
     with st.spinner("Preparing interview structure..."):
-        style = llm.invoke(prompt).content
+        style, grounded = extract_question_style(interview["role"], interview["skills"], interview["type"])
+
+    if not grounded:
+        st.warning("⚠️ No reference questions found. Using default question style.")
 
     interview["question_style"] = style
 
 
-# question asking
-def ask_question(interview, user_answer=""):
+# background prefetch
+@traced("prefetch_opening")
+def _prefetch_opening(interview, history, taken):
     """
-    Ask a natural, human-like follow-up question based on the candidate's answer.
-    Avoid repetition and keep it engaging.
+    Worker: question style first, then the opening question generated
+    against the greeting. The style is stored on the interview as soon as
+    it is known so later turns use it even if the opening misses. Once
+    `taken` is set the caller is generating the question live, so the
+    worker stops instead of producing a second one.
+    """
+    if not interview.get("question_style"):
+        style, _ = extract_question_style(interview["role"], interview["skills"], interview["type"])
+        interview["question_style"] = style
+
+    if taken.is_set():
+        return None
+
+    chain = _question_chain(interview)
+    question = chain.invoke({"input": "", "history": history}).content
+    return f"Hi {interview.get('candidate_name','Candidate')}, nice to meet you! Let's get started. {question}"
+
+
+def start_prefetch(interview):
+    """
+    Call right after the greeting is added: prepares the question style and
+    the first question in the background while the candidate reads.
+    """
+    history = interview["memory"].load_memory_variables({})["history"]
+    taken = threading.Event()
+    interview["prefetch"] = (_prefetch_executor.submit(_prefetch_opening, interview, history, taken), taken)
+
+
+def take_prefetched_opening(interview):
+    """
+    The prefetched first question if it is ready, else None.
+    Used at most once. A job still running finishes its question style,
+    which later turns need, but skips the opening question: the caller
+    generates that live.
     """
+    job = interview.get("prefetch")
+    if job is None:
+        return None
+    interview["prefetch"] = None
+
+    future, taken = job
+    taken.set()
+    if not future.done():
+        cache_lookups.inc(cache="prefetch", result="miss")
+        return None
+    try:
+        opening = future.result()
+    except Exception as e:
+        print("PREFETCH ERROR:", e)
+        opening = None
+    cache_lookups.inc(cache="prefetch", result="hit" if opening else "miss")
+    return opening
+
+
+# question asking
+def _question_chain(interview):
+    from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+
     system_prompt = f"""
 You are a professional, friendly human interviewer named Ihsan.
 - Speak naturally and conversationally.
@@ -128,24 +349,74 @@ Interview Context:
         ("human", "{input}")
     ])
 
-    llm = ChatOllama(model="mistral:latest", streaming=True, temperature=0.7)
+    llm = get_llm("interviewer", temperature=0.7)
+
+    return prompt | llm
 
-    chain = prompt | llm
+
+def stream_question(interview, user_answer=""):
+    """
+    Ask a natural, human-like follow-up question based on the candidate's answer.
+    Avoid repetition and keep it engaging.
+    Yields the reply piece by piece as the model produces it and records
+    time-to-first-token and total time in interview["turn_timings"].
+    """
+    chain = _question_chain(interview)
     history = interview["memory"].load_memory_variables({})["history"]
-    question = ""
 
-    with st.spinner("Thinking..."):
-        for chunk in chain.stream({
-            "input": user_answer,
-            "history": history
-        }):
-            question += chunk.content
+    started = time.perf_counter()
+    first_token = None
 
-    # Add small human-like filler if first question
+    # Add small human-like filler before the generated question
     if not user_answer:
-        question = f"Hi {interview.get('candidate_name','Candidate')}, nice to meet you! Let's get started. {question}"
+        yield f"Hi {interview.get('candidate_name','Candidate')}, nice to meet you! Let's get started. "
     else:
-        question = f"Interesting, thanks for sharing! {question}"
+        yield "Interesting, thanks for sharing! "
+
+    for chunk in chain.stream({
+        "input": user_answer,
+        "history": history
+    }):
+        if not chunk.content:
+            continue
+        if first_token is None:
+            first_token = time.perf_counter() - started
+        yield chunk.content
+
+    timings = interview.setdefault("turn_timings", [])
+    timings.append({
+        "turn": len(timings) + 1,
+        "time_to_first_token": first_token,
+        "total_time": time.perf_counter() - started
+    })
+
+
+@traced("ask_question")
+def ask_question(interview, user_answer="", placeholder=None, format_message=None):
+    """
+    Stream the next question into the page as tokens arrive, then add it
+    to the interview memory. `format_message` wraps the partial text for
+    display (e.g. in a chat bubble). The first question comes from the
+    background prefetch when it finished in time.
+    """
+    placeholder = placeholder or st.empty()
+    format_message = format_message or (lambda text: text)
+
+    opening = take_prefetched_opening(interview)
+    if opening:
+        interview.setdefault("turn_timings", []).append({
+            "turn": len(interview["turn_timings"]) + 1,
+            "time_to_first_token": 0.0,
+            "total_time": 0.0,
+            "prefetched": True
+        })
+
+    question = ""
+    for piece in [opening] if opening else stream_question(interview, user_answer):
+        question += piece
+        placeholder.markdown(format_message(question + "▌"), unsafe_allow_html=True)
+
+    placeholder.markdown(format_message(question), unsafe_allow_html=True)
 
     # Add question to memory
     interview["memory"].chat_memory.add_ai_message(question)
@@ -153,6 +424,55 @@ Interview Context:
 
 # check timer
 def check_timer(interview):
-    if not interview.get("start_time"):
-        return False
-    return (datetime.now() - interview["start_time"]) > timedelta(minutes=15)
\ No newline at end of file
+    deadline = interview_deadline(interview)
+    return deadline is not None and datetime.now() > deadline
+
+
+# feedback generation
+def transcript_hash(turns):
+    digest = hashlib.sha256()
+    for role_type, content in turns:
+        digest.update(role_type.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(content.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+@traced("feedback")
+def generate_feedback(interview):
+    """
+    Generate the feedback report for an interview.
+    The report is cached on the interview record, keyed by interview id and
+    transcript hash, so reruns reuse it until the transcript changes.
+    """
+    memory = interview["memory"]
+    cache_key = f"{interview['id']}:{transcript_hash(memory.chat_memory.turns())}"
+
+    cached = interview.get("feedback")
+    if cached and cached["key"] == cache_key:
+        cache_lookups.inc(cache="feedback", result="hit")
+        return cached["content"]
+    cache_lookups.inc(cache="feedback", result="miss")
+
+    from langchain_core.messages import HumanMessage
+
+    llm = get_llm("feedback")
+    # the whole transcript, not the rolling-summary window used for questions:
+    # the report has to see every answer (and matches the cache key above)
+    history = memory.chat_memory.messages
+
+    feedback_prompt = (
+        f"Please provide professional interview feedback for the candidate {interview['candidate_name']} "
+        f"who interviewed for {interview['role']} at {interview['company']}. "
+        f"The interview was {interview['type']} type focusing on {interview['skills']}. "
+        "Provide specific feedback on: strengths, areas for improvement, and overall performance. "
+        "Format it nicely with clear sections and bullet points."
+    )
+
+    content = llm.invoke(
+        history + [HumanMessage(content=feedback_prompt)]
+    ).content
+
+    interview["feedback"] = {"key": cache_key, "content": content}
+    return content
@@ -0,0 +1,81 @@
+import time
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from metrics import counter, histogram, current_span, record_span
+
+llm_requests = counter(
+    "llm_requests_total", "LLM calls by feature role, model and status", ["role", "model", "status"]
+)
+llm_seconds = histogram(
+    "llm_request_duration_seconds", "LLM call latency, start to last token", ["role", "model"]
+)
+llm_first_token_seconds = histogram(
+    "llm_time_to_first_token_seconds", "LLM time to first streamed token", ["role", "model"]
+)
+llm_tokens = counter(
+    "llm_tokens_total", "Tokens reported by Ollama, by kind (prompt/completion)", ["role", "model", "kind"]
+)
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """
+    Attached to every client from llm_registry.get_llm (and the backend's
+    chat model), so each invoke/stream call is counted with its tokens,
+    latency and time to first token, and traced under the open span.
+    """
+
+    # called directly on the event loop for astream, not via a thread per token
+    run_inline = True
+
+    def __init__(self, role, model):
+        self.role = role
+        self.model = model
+        self._runs = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._runs[run_id] = [time.time(), time.perf_counter(), None, current_span()]
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._runs[run_id] = [time.time(), time.perf_counter(), None, current_span()]
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        run = self._runs.get(run_id)
+        if run is not None and run[2] is None and token:
+            run[2] = time.perf_counter() - run[1]
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+
+        usage = {}
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None) or usage
+
+        self._finish(run, "ok", usage.get("input_tokens", 0), usage.get("output_tokens", 0))
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        run = self._runs.pop(run_id, None)
+        if run is not None:
+            self._finish(run, "error", 0, 0)
+
+    def _finish(self, run, status, prompt_tokens, completion_tokens):
+        started_wall, started, first_token, parent = run
+        elapsed = time.perf_counter() - started
+        labels = {"role": self.role, "model": self.model}
+
+        llm_requests.inc(status=status, **labels)
+        llm_seconds.observe(elapsed, **labels)
+        if first_token is not None:
+            llm_first_token_seconds.observe(first_token, **labels)
+        llm_tokens.inc(prompt_tokens, kind="prompt", **labels)
+        llm_tokens.inc(completion_tokens, kind="completion", **labels)
+
+        record_span(
+            "llm", started_wall, elapsed, status, parent,
+            role=self.role, model=self.model, time_to_first_token=first_token,
+            prompt_tokens=prompt_tokens, completion_tokens=completion_tokens
+        )
@@ -0,0 +1,62 @@
+import os
+import threading
+
+# ollama connection settings
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+OLLAMA_TIMEOUT = float(os.getenv("OLLAMA_TIMEOUT", "120"))
+OLLAMA_MAX_CONNECTIONS = int(os.getenv("OLLAMA_MAX_CONNECTIONS", "20"))
+
+# one place to configure which model each feature uses
+MODELS = {
+    "interviewer": os.getenv("INTERVIEWER_MODEL", "mistral:latest"),
+    "question_style": os.getenv("QUESTION_STYLE_MODEL", "mistral:latest"),
+    "summary": os.getenv("SUMMARY_MODEL", "mistral:latest"),
+    "feedback": os.getenv("FEEDBACK_MODEL", "mistral:latest"),
+    "support": os.getenv("SUPPORT_MODEL", "mistral:latest"),
+    "ai_chatbot": os.getenv("AI_CHATBOT_MODEL", "deepseek-r1:1.5b"),
+}
+
+_clients = {}
+_lock = threading.Lock()
+
+
+def get_llm(role, **params):
+    """
+    Return a long-lived ChatOllama client for a feature role (see MODELS)
+    and sampling parameters. Clients are shared process-wide, so their
+    HTTP connections are kept alive and reused between calls.
+    """
+    model = MODELS.get(role, role)
+    # per role, so LLM metrics are labelled by feature even when models match
+    key = (role, model, tuple(sorted(params.items())))
+
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            # imported on first use: langchain_ollama is the slowest import in the app
+            import httpx
+            from langchain_ollama import ChatOllama
+            from llm_metrics import LLMMetricsCallback
+
+            client = ChatOllama(
+                model=model,
+                base_url=OLLAMA_BASE_URL,
+                keep_alive=OLLAMA_KEEP_ALIVE,
+                client_kwargs={
+                    "timeout": OLLAMA_TIMEOUT,
+                    "limits": httpx.Limits(
+                        max_connections=OLLAMA_MAX_CONNECTIONS,
+                        max_keepalive_connections=OLLAMA_MAX_CONNECTIONS,
+                        keepalive_expiry=60
+                    )
+                },
+                callbacks=[LLMMetricsCallback(role, model)],
+                **params
+            )
+            _clients[key] = client
+    return client
@@ -0,0 +1,359 @@
+"""
+Process-wide metrics and trace spans in the Prometheus text format.
+
+Counters and histograms are created once at import time, where they are
+used, and updated from any thread. Existing stats() dictionaries (caches,
+queues, the question bank) are registered as collectors and read at
+scrape time, so nothing is counted twice.
+
+Nothing leaves the process unless configured:
+  METRICS_PORT  serve /metrics over HTTP on this port, unauthenticated,
+                on METRICS_HOST (default 127.0.0.1; set 0.0.0.0 only
+                behind a firewall or for a scraper on another host)
+  METRICS_FILE  rewrite this file every METRICS_FLUSH_SECONDS (for the
+                node_exporter textfile collector)
+  TRACE_FILE    append one JSON line per finished span
+"""
+import os
+import re
+import json
+import time
+import uuid
+import bisect
+import functools
+import threading
+import contextvars
+from contextlib import contextmanager
+
+# export configuration
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_FILE = os.getenv("METRICS_FILE", "")
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "15"))
+TRACE_FILE = os.getenv("TRACE_FILE", "")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# seconds; LLM calls run from tens of milliseconds (cached) to minutes
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+_INVALID_NAME = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# metric types
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        """[(sample name, labels, value)]"""
+        with self._lock:
+            return [(self.name, dict(zip(self.labels, key)), value) for key, value in self._values.items()]
+
+
+class Histogram(Counter):
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # per-bucket counts (made cumulative on render), sum, count
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def samples(self):
+        with self._lock:
+            states = [(key, list(counts), total, count) for key, (counts, total, count) in self._values.items()]
+
+        samples = []
+        for key, counts, total, count in states:
+            labels = dict(zip(self.labels, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                samples.append((f"{self.name}_bucket", {**labels, "le": _format_value(float(bound))}, cumulative))
+            samples.append((f"{self.name}_bucket", {**labels, "le": "+Inf"}, count))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, count))
+        return samples
+
+
+# registry
+def _flatten(name, value, labels):
+    """Numeric leaves of a stats() dictionary as (name, labels, value)."""
+    if isinstance(value, bool):
+        yield name, labels, int(value)
+    elif isinstance(value, (int, float)):
+        yield name, labels, value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield from _flatten(f"{name}_{_INVALID_NAME.sub('_', str(key))}", item, labels)
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name, help, labels=()):
+        return self._get(Counter, name, help, labels)
+
+    def histogram(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        return self._get(Histogram, name, help, labels, buckets)
+
+    def register_stats(self, prefix, stats, label=None):
+        """
+        Expose an existing zero-argument stats() function as gauges named
+        `<prefix>_<key>`. With `label`, top-level keys become values of
+        that label instead (e.g. per-statement or per-intent stats).
+        Registering the same prefix again replaces the collector.
+        """
+        with self._lock:
+            self._collectors[prefix] = (stats, label)
+
+    def _collect(self):
+        with self._lock:
+            collectors = list(self._collectors.items())
+
+        gauges = {}
+        for prefix, (stats, label) in collectors:
+            try:
+                values = stats()
+            except Exception as e:
+                print("METRICS COLLECTOR ERROR:", prefix, e)
+                continue
+
+            if label:
+                leaves = (
+                    sample
+                    for key, value in values.items()
+                    for sample in _flatten(prefix, value, {label: key})
+                )
+            else:
+                leaves = _flatten(prefix, values, {})
+
+            for name, labels, value in leaves:
+                gauges.setdefault(name, []).append((name, labels, value))
+        return gauges
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+
+        lines = []
+        for metric in metrics:
+            samples = metric.samples()
+            if not samples:
+                continue
+            lines.append(f"# HELP {metric.name} {_escape(metric.help)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for name, labels, value in samples)
+
+        for name, samples in sorted(self._collect().items()):
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for _, labels, value in samples)
+
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+counter = registry.counter
+histogram = registry.histogram
+register_stats = registry.register_stats
+
+# shared vocabulary for the hot paths
+span_seconds = histogram(
+    "span_duration_seconds", "Duration of traced operations", ["span", "status"]
+)
+cache_lookups = counter(
+    "cache_lookups_total", "Cache lookups by cache and result (hit/miss)", ["cache", "result"]
+)
+
+
+# tracing
+_current_span = contextvars.ContextVar("metrics_span", default=None)
+_trace_lock = threading.Lock()
+
+
+def current_span():
+    return _current_span.get()
+
+
+def record_span(name, started, elapsed, status="ok", parent=None, **attrs):
+    """
+    Record a finished operation: observed in span_duration_seconds and,
+    with TRACE_FILE set, written as a trace line linked to its parent.
+    """
+    span_seconds.observe(elapsed, span=name, status=status)
+    if not TRACE_FILE:
+        return
+
+    line = json.dumps({
+        "trace_id": parent["trace_id"] if parent else uuid.uuid4().hex,
+        "span_id": attrs.pop("span_id", None) or uuid.uuid4().hex[:16],
+        "parent_id": parent["span_id"] if parent else None,
+        "name": name,
+        "start": started,
+        "duration_s": elapsed,
+        "status": status,
+        "attrs": attrs
+    }, default=str)
+    with _trace_lock:
+        with open(TRACE_FILE, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+@contextmanager
+def span(name, **attrs):
+    """
+    Time a block as `name`. Spans opened inside it (in the same thread)
+    become its children. Yields a dict the block can add attributes to.
+    """
+    parent = _current_span.get()
+    context = {
+        "trace_id": parent["trace_id"] if parent else uuid.uuid4().hex,
+        "span_id": uuid.uuid4().hex[:16],
+        "attrs": dict(attrs)
+    }
+    token = _current_span.set(context)
+    started_wall = time.time()
+    started = time.perf_counter()
+    status = "ok"
+    try:
+        yield context["attrs"]
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        _current_span.reset(token)
+        record_span(
+            name, started_wall, time.perf_counter() - started, status, parent,
+            span_id=context["span_id"], **context["attrs"]
+        )
+
+
+def traced(name):
+    """Decorator form of span() for plain (non-generator) functions."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# export
+_exporter_started = False
+_exporter_lock = threading.Lock()
+
+
+def write_metrics_file(path=None):
+    """Atomically replace the metrics file, so a scraper never reads half of it."""
+    path = path or METRICS_FILE
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(registry.render())
+    os.replace(tmp, path)
+
+
+def _flush_loop():
+    while True:
+        try:
+            write_metrics_file()
+        except Exception as e:
+            print("METRICS FILE ERROR:", e)
+        time.sleep(METRICS_FLUSH_SECONDS)
+
+
+def _serve(port, host=METRICS_HOST):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+
+
+def start_exporter():
+    """
+    Start the configured exporters (METRICS_PORT, METRICS_FILE) once per
+    process; later calls, e.g. on Streamlit reruns, do nothing.
+    """
+    global _exporter_started
+    with _exporter_lock:
+        if _exporter_started:
+            return
+        _exporter_started = True
+
+    if METRICS_PORT:
+        try:
+            _serve(METRICS_PORT)
+        except OSError as e:
+            print("METRICS PORT ERROR:", e)
+    if METRICS_FILE:
+        threading.Thread(target=_flush_loop, name="metrics-file", daemon=True).start()
@@ -0,0 +1,287 @@
+"""
+Offline interview question bank.
+
+A BM25 inverted index over a local JSONL corpus, one question per line:
+
+    {"question": "...", "role": "Data Scientist", "type": "Technical", "skills": ["python", "sql"]}
+
+Used as a retrieval backend next to (or instead of) SerpAPI:
+
+    python question_bank.py add questions.jsonl
+    python question_bank.py add questions.txt --role "Backend Developer" --type Technical --skills "go, sql"
+    python question_bank.py search "Data Scientist" --skills "python, sql" --type Technical
+    python question_bank.py stats
+"""
+import os
+import re
+import sys
+import json
+import math
+import argparse
+import threading
+from collections import Counter, defaultdict
+
+from metrics import register_stats, span, traced
+
+# retrieval configuration
+QUESTION_BANK_PATH = os.getenv(
+    "QUESTION_BANK_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "question_bank.jsonl")
+)
+# local: question bank only, web: SerpAPI with the bank as fallback,
+# hybrid: bank first, SerpAPI only when the bank has too few matches
+RETRIEVAL_BACKEND = os.getenv("RETRIEVAL_BACKEND", "hybrid").lower()
+QUESTION_BANK_TOP_K = int(os.getenv("QUESTION_BANK_TOP_K", "12"))
+QUESTION_BANK_MIN_HITS = int(os.getenv("QUESTION_BANK_MIN_HITS", "5"))
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+INTERVIEW_TYPES = ("technical", "behavioral", "situational")
+
+STOPWORDS = frozenset("""
+a an the and or of to in on at for with by from as is are was were be been do does did you your
+i me my we our it its this that these those can could would how what when where which who why
+tell describe about interview interviews question questions
+""".split())
+
+
+def tokenize(text):
+    """Lowercased words; keeps tech spellings like c++, c#, node.js."""
+    tokens = []
+    for token in re.findall(r"[a-z0-9][a-z0-9+#.]*", (text or "").lower()):
+        token = token.rstrip(".")
+        if token in STOPWORDS:
+            continue
+        if len(token) > 4 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def split_skills(skills):
+    if isinstance(skills, str):
+        skills = re.split(r"[,\n;]", skills)
+    return [s.strip().lower() for s in skills or [] if s and s.strip()]
+
+
+def normalize_type(interview_type):
+    interview_type = (interview_type or "").strip().lower()
+    return interview_type if interview_type in INTERVIEW_TYPES else ""
+
+
+class QuestionBank:
+    """
+    In-memory BM25 index over the corpus file.
+    Role and skill tags are indexed alongside the question text so a query
+    built from the interview setup matches on both; the interview type is
+    a filter, not a search term. The file is
+    re-read when it changes on disk (e.g. after an ingest).
+    """
+
+    def __init__(self, path=QUESTION_BANK_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime = None
+        self.docs = []
+        self.postings = {}
+        self.doc_lengths = []
+        self.avg_length = 0.0
+
+    # index
+    def _load(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = None
+
+        with self._lock:
+            if mtime == self._mtime:
+                return
+
+            docs = []
+            if mtime is not None:
+                with open(self.path, encoding="utf-8") as f:
+                    for line in f:
+                        line = line.strip()
+                        if line:
+                            docs.append(json.loads(line))
+
+            postings = defaultdict(list)
+            lengths = []
+            for doc_id, doc in enumerate(docs):
+                terms = tokenize(" ".join([
+                    doc["question"],
+                    doc.get("role", ""),
+                    " ".join(doc.get("skills", []))
+                ]))
+                for term, freq in Counter(terms).items():
+                    postings[term].append((doc_id, freq))
+                lengths.append(len(terms))
+
+            self.docs = docs
+            self.postings = dict(postings)
+            self.doc_lengths = lengths
+            self.avg_length = sum(lengths) / len(lengths) if lengths else 0.0
+            self._mtime = mtime
+
+    def search(self, role="", skills="", interview_type="", k=QUESTION_BANK_TOP_K):
+        """
+        Top-k questions for an interview setup, best first.
+        Only role and skill terms score, so an unknown role returns few or
+        no hits (and hybrid retrieval falls back to the web). Mixed (or
+        unknown) type searches every type; otherwise questions of other
+        types only fill in when the requested type has no match.
+        """
+        self._load()
+        if not self.docs:
+            return []
+
+        terms = tokenize(role) + tokenize(" ".join(split_skills(skills)))
+        wanted_type = normalize_type(interview_type)
+
+        n = len(self.docs)
+        scores = defaultdict(float)
+        for term in set(terms):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, freq in postings:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[doc_id] / self.avg_length)
+                scores[doc_id] += idf * freq * (BM25_K1 + 1) / (freq + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        if wanted_type:
+            same_type = [item for item in ranked if self.docs[item[0]].get("type", "").lower() == wanted_type]
+            ranked = same_type or ranked
+
+        return [dict(self.docs[doc_id], score=round(score, 3)) for doc_id, score in ranked[:k]]
+
+    def context(self, role="", skills="", interview_type="", k=QUESTION_BANK_TOP_K):
+        """Search results as plain text, shaped like a web search snippet."""
+        return "\n".join(f"- {doc['question']}" for doc in self.search(role, skills, interview_type, k))
+
+    # ingestion
+    def add(self, records):
+        """Append question records to the corpus, skipping duplicates. Returns the number added."""
+        self._load()
+        seen = {doc["question"].strip().lower() for doc in self.docs}
+
+        added = []
+        for record in records:
+            question = (record.get("question") or "").strip()
+            if not question or question.lower() in seen:
+                continue
+            seen.add(question.lower())
+            added.append({
+                "question": question,
+                "role": (record.get("role") or "any").strip(),
+                "type": (record.get("type") or "Technical").strip().title(),
+                "skills": split_skills(record.get("skills"))
+            })
+
+        if added:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                for record in added:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return len(added)
+
+    def stats(self):
+        self._load()
+        return {
+            "questions": len(self.docs),
+            "terms": len(self.postings),
+            "roles": len({doc.get("role", "").lower() for doc in self.docs}),
+            "by_type": dict(Counter(doc.get("type", "") for doc in self.docs))
+        }
+
+
+# shared index; loaded lazily on first search
+question_bank = QuestionBank()
+register_stats("question_bank", question_bank.stats)
+
+
+@traced("retrieval")
+def retrieve_context(role, skills="", interview_type="", web_search=None, limit=2000):
+    """
+    Grounding text for question generation according to RETRIEVAL_BACKEND.
+    `web_search` is a zero-argument callable returning search text (the
+    caller's SerpAPI query); it may raise. Returns "" if nothing was found.
+    """
+    def web():
+        if web_search is None:
+            return ""
+        try:
+            with span("web_search"):
+                return web_search() or ""
+        except Exception as e:
+            print("WEB SEARCH ERROR:", e)
+            return ""
+
+    if RETRIEVAL_BACKEND == "web":
+        text = web() or question_bank.context(role, skills, interview_type)
+    elif RETRIEVAL_BACKEND == "local":
+        text = question_bank.context(role, skills, interview_type)
+    else:
+        hits = question_bank.search(role, skills, interview_type)
+        text = "\n".join(f"- {doc['question']}" for doc in hits)
+        if len(hits) < QUESTION_BANK_MIN_HITS:
+            text = "\n".join(filter(None, [text, web()]))
+
+    return text[:limit]
+
+
+# ingestion CLI
+def _read_records(path, defaults):
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            records = [json.loads(line) for line in f if line.strip()]
+        elif path.endswith(".json"):
+            records = json.load(f)
+        else:
+            # plain text: one question per line
+            records = [{"question": line} for line in f if line.strip()]
+
+    for record in records:
+        for key, value in defaults.items():
+            if value and not record.get(key):
+                record[key] = value
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bank", default=QUESTION_BANK_PATH, help="corpus file (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="ingest a .jsonl, .json or one-question-per-line .txt file")
+    add.add_argument("file")
+    add.add_argument("--role", help="role tag for records without one")
+    add.add_argument("--type", help="interview type for records without one")
+    add.add_argument("--skills", help="comma-separated skill tags for records without any")
+
+    search = commands.add_parser("search", help="query the index")
+    search.add_argument("role")
+    search.add_argument("--skills", default="")
+    search.add_argument("--type", default="")
+    search.add_argument("-k", type=int, default=QUESTION_BANK_TOP_K)
+
+    commands.add_parser("stats", help="corpus summary")
+
+    args = parser.parse_args(argv)
+    bank = QuestionBank(args.bank)
+
+    if args.command == "add":
+        records = _read_records(args.file, {"role": args.role, "type": args.type, "skills": args.skills})
+        print(f"added {bank.add(records)} of {len(records)} questions to {args.bank}")
+    elif args.command == "search":
+        for doc in bank.search(args.role, args.skills, args.type, args.k):
+            print(f"{doc['score']:>7.3f}  [{doc['type']}] {doc['question']}")
+    else:
+        print(json.dumps(bank.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
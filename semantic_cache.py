@@ -0,0 +1,160 @@
+import os
+import re
+import math
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+from metrics import register_stats
+
+# cache configuration
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.72"))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "500"))
+SEMANTIC_CACHE_TTL = int(os.getenv("SEMANTIC_CACHE_TTL", str(24 * 3600)))
+SEMANTIC_CACHE_DIMS = 1 << 14
+
+
+# function words carry no meaning for matching support questions
+STOPWORDS = frozenset("""
+a an the and or but if of to in on at for with by from about as into is are was were be been
+being do does did doing have has had i me my we our you your it its this that these those
+can could would should will shall may might must how what when where which who whom why
+there here so than too very just please tell know want like get any some
+""".split())
+
+
+def _terms(text):
+    terms = []
+    for word in re.sub(r"[^a-z0-9 ]+", " ", text.lower()).split():
+        if word in STOPWORDS:
+            continue
+        # light stemming so "interviews"/"interview" and "lasts"/"last" match
+        for suffix in ("ing", "ed", "es", "s"):
+            if len(word) > len(suffix) + 3 and word.endswith(suffix):
+                word = word[:-len(suffix)]
+                break
+        terms.append(word)
+    return terms
+
+
+def embed(text, dims=SEMANTIC_CACHE_DIMS):
+    """
+    Hashed n-gram vector over content words: whole words and word pairs
+    carry the meaning, character trigrams add tolerance for typos.
+    Returned as a sparse {index: weight} dict with unit length.
+    """
+    terms = _terms(text)
+    features = [(f"w:{t}", 1.0) for t in terms]
+    features.extend((f"b:{a}_{b}", 0.5) for a, b in zip(terms, terms[1:]))
+    for term in terms:
+        padded = f" {term} "
+        features.extend((padded[i:i + 3], 0.2) for i in range(len(padded) - 2))
+
+    vector = {}
+    for feature, weight in features:
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        index = int.from_bytes(digest[:4], "little") % dims
+        vector[index] = vector.get(index, 0.0) + (weight if digest[4] & 1 else -weight)
+
+    norm = math.sqrt(sum(v * v for v in vector.values()))
+    return {i: v / norm for i, v in vector.items()} if norm else {}
+
+
+def similarity(a, b):
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(i, 0.0) for i, v in a.items())
+
+
+class SemanticCache:
+    """
+    Near-duplicate question -> answer cache for the support chatbot.
+    Entries are scoped to a context (the system prompt); a new context
+    invalidates everything stored under the old one. Within it, every
+    entry belongs to a named scope and lookups only match the same scope,
+    so answers are never shared beyond what the caller chose to share.
+    """
+
+    def __init__(self, threshold=SEMANTIC_CACHE_THRESHOLD,
+                 max_entries=SEMANTIC_CACHE_MAX_ENTRIES, ttl=SEMANTIC_CACHE_TTL):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # (scope, question) -> (vector, answer, stored_at)
+        self._context = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _context_key(context):
+        return hashlib.sha256(context.encode("utf-8")).hexdigest()
+
+    def _check_context(self, context):
+        key = self._context_key(context)
+        if key != self._context:
+            self._entries.clear()
+            self._context = key
+
+    def get(self, question, context="", scope=""):
+        vector = embed(question)
+        if not vector:
+            return None
+        now = time.time()
+
+        with self._lock:
+            self._check_context(context)
+
+            best, best_score = None, 0.0
+            for key, (stored, answer, stored_at) in list(self._entries.items()):
+                if now - stored_at > self.ttl:
+                    del self._entries[key]
+                    self.evictions += 1
+                    continue
+                if key[0] != scope:
+                    continue
+                score = similarity(vector, stored)
+                if score > best_score:
+                    best, best_score = key, score
+
+            if best is not None and best_score >= self.threshold:
+                self._entries.move_to_end(best)
+                self.hits += 1
+                return self._entries[best][1]
+
+            self.misses += 1
+            return None
+
+    def put(self, question, answer, context="", scope=""):
+        vector = embed(question)
+        if not vector:
+            return
+        with self._lock:
+            self._check_context(context)
+            self._entries[(scope, question)] = (vector, answer, time.time())
+            self._entries.move_to_end((scope, question))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
+# shared by every session in the process; callers choose what may be shared
+# through the scope (see support_chatbot.support_reply)
+support_cache = SemanticCache()
+register_stats("support_cache", support_cache.stats)
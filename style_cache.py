@@ -0,0 +1,176 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+
+from metrics import register_stats
+
+# cache configuration
+STYLE_CACHE_PATH = os.getenv(
+    "STYLE_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "question_style.sqlite3")
+)
+STYLE_CACHE_TTL = int(os.getenv("STYLE_CACHE_TTL", str(7 * 24 * 3600)))
+STYLE_CACHE_MAX_ENTRIES = int(os.getenv("STYLE_CACHE_MAX_ENTRIES", "500"))
+STYLE_CACHE_MAX_BYTES = int(os.getenv("STYLE_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+
+
+def normalize_key(role, skills, interview_type):
+    """
+    Build a stable cache key from (role, skills, type).
+    Case, spacing and skill order don't matter.
+    """
+    def clean(text):
+        return re.sub(r"\s+", " ", (text or "").strip().lower())
+
+    skill_set = sorted({clean(s) for s in re.split(r"[,\n;]", skills or "") if clean(s)})
+    raw = "|".join([clean(role), ",".join(skill_set), clean(interview_type)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class QuestionStyleCache:
+    """
+    Disk-backed LRU cache for extracted question styles.
+    Backed by SQLite in WAL mode so several Streamlit worker processes can
+    share one file; hit/miss counters live in the same database.
+    """
+
+    def __init__(self, path=STYLE_CACHE_PATH, ttl=STYLE_CACHE_TTL,
+                 max_entries=STYLE_CACHE_MAX_ENTRIES, max_bytes=STYLE_CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._schema_ready = False
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            if not self._schema_ready:
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS styles (
+                        key TEXT PRIMARY KEY,
+                        style TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        created_at REAL NOT NULL,
+                        last_access REAL NOT NULL
+                    );
+                    CREATE INDEX IF NOT EXISTS styles_last_access ON styles (last_access);
+                    CREATE TABLE IF NOT EXISTS stats (
+                        name TEXT PRIMARY KEY,
+                        value INTEGER NOT NULL
+                    );
+                """)
+                self._schema_ready = True
+        return conn
+
+    def _bump(self, conn, name, amount=1):
+        conn.execute(
+            "INSERT INTO stats (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount)
+        )
+
+    def get(self, role, skills, interview_type):
+        key = normalize_key(role, skills, interview_type)
+        now = time.time()
+        conn = self._conn()
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT style, created_at FROM styles WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row and now - row[1] <= self.ttl:
+                conn.execute("UPDATE styles SET last_access = ? WHERE key = ?", (now, key))
+                self._bump(conn, "hits")
+                conn.execute("COMMIT")
+                return row[0]
+
+            if row:
+                conn.execute("DELETE FROM styles WHERE key = ?", (key,))
+                self._bump(conn, "expired")
+            self._bump(conn, "misses")
+            conn.execute("COMMIT")
+            return None
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def set(self, role, skills, interview_type, style):
+        key = normalize_key(role, skills, interview_type)
+        now = time.time()
+        conn = self._conn()
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO styles (key, style, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, style, len(style.encode("utf-8")), now, now)
+            )
+            self._evict(conn, now)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _evict(self, conn, now):
+        removed = conn.execute(
+            "DELETE FROM styles WHERE created_at < ?", (now - self.ttl,)
+        ).rowcount
+
+        count, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM styles"
+        ).fetchone()
+
+        # drop least recently used entries until both limits hold
+        if count > self.max_entries or total > self.max_bytes:
+            for key, size in conn.execute(
+                "SELECT key, size FROM styles ORDER BY last_access ASC"
+            ).fetchall():
+                if count <= self.max_entries and total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM styles WHERE key = ?", (key,))
+                count -= 1
+                total -= size
+                removed += 1
+
+        if removed:
+            self._bump(conn, "evictions", removed)
+
+    def stats(self):
+        conn = self._conn()
+        counters = dict(conn.execute("SELECT name, value FROM stats").fetchall())
+        entries, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM styles"
+        ).fetchone()
+        hits = counters.get("hits", 0)
+        misses = counters.get("misses", 0)
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "evictions": counters.get("evictions", 0),
+            "expired": counters.get("expired", 0),
+            "entries": entries,
+            "bytes": total
+        }
+
+    def clear(self):
+        conn = self._conn()
+        conn.execute("DELETE FROM styles")
+        conn.execute("DELETE FROM stats")
+
+
+style_cache = QuestionStyleCache()
+register_stats("style_cache", style_cache.stats)
@@ -1,6 +1,21 @@
+import os
 import streamlit as st
-from langchain_ollama import ChatOllama
-from interviewer import new_interview, get_active  
+
+from llm_registry import get_llm
+from metrics import traced
+from interview_memory import estimate_tokens
+from semantic_cache import support_cache
+from support_router import SUPPORT_SYSTEM_PROMPT, is_question, route_support_message
+from interviewer import new_interview, get_active
+
+# token budget for the conversation window sent with each request
+SUPPORT_TOKEN_BUDGET = int(os.getenv("SUPPORT_TOKEN_BUDGET", "1200"))
+
+# cache scope for opening questions: no earlier turn reached the model, so
+# their answers are the same for everyone and may be shared (greetings and
+# other canned replies before them don't count)
+SUPPORT_CACHE_SCOPE = "first_turn"
+
 
 # support chat initialization
 def init_support_chat(session_state):
@@ -10,6 +25,75 @@ def init_support_chat(session_state):
     if "support_processing" not in session_state:
         session_state.support_processing = False
 
+    if "support_window_start" not in session_state:
+        session_state.support_window_start = 0
+
+
+# request building
+def build_support_messages(history, window_start, budget=SUPPORT_TOKEN_BUDGET):
+    """
+    Return (messages, window_start) for the next request.
+    The window start only moves when the budget is exceeded, and then jumps
+    far enough to leave half the budget free. Between jumps every request
+    extends the previous one, so Ollama can reuse its cached prefix.
+    """
+    window_start = min(window_start, len(history))
+    costs = [estimate_tokens(msg["content"]) for msg in history]
+
+    if sum(costs[window_start:]) > budget:
+        used = sum(costs[window_start:])
+        # always keep the newest message, and start the window on a user turn
+        while window_start < len(history) - 1 and (
+            used > budget // 2 or history[window_start]["role"] != "user"
+        ):
+            used -= costs[window_start]
+            window_start += 1
+
+    from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
+
+    messages = [SystemMessage(content=SUPPORT_SYSTEM_PROMPT)]
+    for msg in history[window_start:]:
+        if msg["role"] == "user":
+            messages.append(HumanMessage(content=msg["content"]))
+        else:
+            messages.append(AIMessage(content=msg["content"]))
+
+    return messages, window_start
+
+
+@traced("support_reply")
+def support_reply(session_state):
+    """
+    Answer the latest support message.
+    Opening questions that are near-duplicates of earlier ones are answered
+    from the semantic cache; follow-ups ("can I delete it?") depend on the
+    conversation, so they and everything else go to the LLM with the
+    bounded message window. Messages answered here are marked "model_turn";
+    only those make later questions follow-ups.
+    """
+    latest = session_state.support_messages[-1]
+    question = latest["content"]
+    standalone = not any(msg.get("model_turn") for msg in session_state.support_messages[:-1])
+    latest["model_turn"] = True
+
+    # entries are tied to the system prompt, so editing it invalidates them
+    if standalone:
+        cached = support_cache.get(question, SUPPORT_SYSTEM_PROMPT, scope=SUPPORT_CACHE_SCOPE)
+        if cached is not None:
+            return cached
+
+    messages, session_state.support_window_start = build_support_messages(
+        session_state.support_messages,
+        session_state.support_window_start
+    )
+
+    llm = get_llm("support", temperature=0.4)
+    answer = llm.invoke(messages).content.strip()
+
+    if standalone:
+        support_cache.put(question, answer, SUPPORT_SYSTEM_PROMPT, scope=SUPPORT_CACHE_SCOPE)
+    return answer
+
 
 # support chat rendering
 def render_support_chat(session_state):
@@ -47,49 +131,29 @@ def render_support_chat(session_state):
             "content": user_input
         })
 
-        llm = ChatOllama(
-            model="mistral:latest",
-            temperature=0.4
-        )
+        # Canned intents and actions are handled without the LLM
+        decision = route_support_message(user_input)
+
+        # agent action: start interview (a question never creates one)
+        if decision["intent"] == "start_interview" and not is_question(user_input):
+            active = get_active(st.session_state)
+            session_state.support_messages.append({
+                "role": "assistant",
+                "content": "An interview is already active. You can continue with it." if active
+                else "Interview has been started successfully. You can now proceed with the setup."
+            })
+            session_state.support_processing = False
 
-        # system prompt
-        system_prompt = """
-You are a professional human support agent for an AI interview platform.
-
-Rules:
-- Greet the user respectfully when they start a chat.
-- Only answer questions about the AI Professional Interviewer platform features, setup, and usage.
-- Do NOT answer questions outside the scope of the platform.
-- if someone asks questions out of scope respond with "I'm sorry, but I can only assist with questions related to the AI Professional Interviewer platform." and do not provide any additional information.
-- If asked "Who are you?", respond: "I am the AI Professional Interviewer platform support chatbot."
-- If asked "How are you?", respond: "I pretty good, thanks for asking! How can I assist you today?"
-- Help users with queries about the platform clearly and concisely.
-- Keep answers short, to the point, and avoid extra explanations.
-- Do not provide extra information unless specifically asked.
-- Answer only what the user asks.
-- Keep responses short, clear, and human-like.
-- Do not proactively suggest starting an interview.
-- Only trigger interview start if the user explicitly requests it and don't give explanations about the interview process unless asked.
-- Provide guidance about the platform features when asked.
-- Avoid generic overviews or repeated suggestions.
-- Be friendly and approachable.
-- Respond in plain text. Do not use HTML or markdown.
-- Respect the app behavior:
-    - Interviews last exactly 15 minutes
-    - Setup, interview, feedback stages exist
-    - New interviews can be started via user request
-"""
-
-        # Build conversation for LLM
-        conversation = system_prompt.strip() + "\n\n"
-        for msg in session_state.support_messages:
-            conversation += f"{msg['role'].upper()}: {msg['content']}\n"
-
-        # Call LLM
-        with st.spinner("Support is responding..."):
-            response = llm.invoke(conversation)
-
-        assistant_text = response.content.strip()
+            if not active:
+                # new_interview makes it active and reruns into the setup stage
+                new_interview(st.session_state)
+            st.rerun()
+
+        if decision["reply"] is not None:
+            assistant_text = decision["reply"]
+        else:
+            with st.spinner("Support is responding..."):
+                assistant_text = support_reply(session_state)
 
         # Save assistant response
         session_state.support_messages.append({
@@ -97,26 +161,5 @@ Rules:
             "content": assistant_text
         })
 
-        # agent action: start interview
-        trigger_keywords = ["start interview", "begin interview", "initiate interview"]
-        if any(keyword in user_input.lower() for keyword in trigger_keywords):
-            active = get_active(st.session_state)
-            if not active:
-                # Create a new interview
-                new_interview(st.session_state)
-
-                # Automatically set it as active so main app goes to setup
-                st.session_state.active_interview_id = st.session_state.active_interview_id
-
-                session_state.support_messages.append({
-                    "role": "assistant",
-                    "content": "Interview has been started successfully. You can now proceed with the setup."
-                })
-            else:
-                session_state.support_messages.append({
-                    "role": "assistant",
-                    "content": "An interview is already active. You can continue with it."
-                })
-
         session_state.support_processing = False
         st.rerun()
\ No newline at end of file
@@ -0,0 +1,119 @@
+import re
+import threading
+
+from interview_deadlines import INTERVIEW_MINUTES
+from metrics import register_stats
+
+# system prompt, shared by the Streamlit support chat and the backend
+# (fixed per process so every request starts with the same bytes)
+SUPPORT_SYSTEM_PROMPT = f"""You are a professional human support agent for an AI interview platform.
+
+Rules:
+- Greet the user respectfully when they start a chat.
+- Only answer questions about the AI Professional Interviewer platform features, setup, and usage.
+- Do NOT answer questions outside the scope of the platform.
+- if someone asks questions out of scope respond with "I'm sorry, but I can only assist with questions related to the AI Professional Interviewer platform." and do not provide any additional information.
+- If asked "Who are you?", respond: "I am the AI Professional Interviewer platform support chatbot."
+- If asked "How are you?", respond: "I pretty good, thanks for asking! How can I assist you today?"
+- Help users with queries about the platform clearly and concisely.
+- Keep answers short, to the point, and avoid extra explanations.
+- Do not provide extra information unless specifically asked.
+- Answer only what the user asks.
+- Keep responses short, clear, and human-like.
+- Do not proactively suggest starting an interview.
+- Only trigger interview start if the user explicitly requests it and don't give explanations about the interview process unless asked.
+- Provide guidance about the platform features when asked.
+- Avoid generic overviews or repeated suggestions.
+- Be friendly and approachable.
+- Respond in plain text. Do not use HTML or markdown.
+- Respect the app behavior:
+    - Interviews last exactly {INTERVIEW_MINUTES} minutes
+    - Setup, interview, feedback stages exist
+    - New interviews can be started via user request"""
+
+# canned replies (the support system prompt asks the model for the same text)
+OUT_OF_SCOPE_REPLY = "I'm sorry, but I can only assist with questions related to the AI Professional Interviewer platform."
+WHO_ARE_YOU_REPLY = "I am the AI Professional Interviewer platform support chatbot."
+HOW_ARE_YOU_REPLY = "I pretty good, thanks for asking! How can I assist you today?"
+GREETING_REPLY = "Hello! How can I assist you with the AI Professional Interviewer platform today?"
+THANKS_REPLY = "You're welcome! Let me know if there's anything else I can help with."
+
+# words that mean the message is about the platform, whatever else it says
+PLATFORM_TERMS = re.compile(
+    r"\b(interview\w*|feedback|timer?|minutes?|setup|stages?|support|platform|app|account|"
+    r"password|log ?in|sign ?up|register|questions?|roles?|skills?|company|practice|candidate|"
+    r"technical|behavioral|behavioural|situational|mixed|download|delete|chat\w*|report)\b"
+)
+
+OFF_TOPIC = re.compile(
+    r"\b(weather|forecast|news|recipe|cook\w*|joke|poem|song|lyrics|movie|film|football|soccer|"
+    r"cricket|sports?|stock|crypto\w*|bitcoin|capital of|translate|homework|essay|story|"
+    r"president|election|horoscope|dating)\b"
+    r"|^\s*(what is|calculate|solve)\s*[\d(]"
+)
+
+GREETING = re.compile(r"^\s*(hi|hello|hey|hiya|good (morning|afternoon|evening))\b[\s!.,]*(there)?[\s!.]*$")
+THANKS = re.compile(r"^\s*(thanks|thank you|thx|cheers)( so much| a lot| very much)?[\s!.,]*$")
+# whole-message small talk only; "how are you timing the interview?" is a question
+WHO_ARE_YOU = re.compile(r"^\s*((hi|hello|hey)[\s,!.]*)?who\s+(are|r)\s+(you|u)[\s?!.]*$")
+HOW_ARE_YOU = re.compile(
+    r"^\s*((hi|hello|hey)[\s,!.]*)?how\s+(are|r)\s+(you|u)( doing)?( today)?[\s?!.]*$"
+)
+
+# explicit requests only; "how do I start an interview?" is a question
+START_INTERVIEW = re.compile(
+    r"\b(start|begin|initiate|launch|create|open)\s+(a\s+|an\s+|the\s+|my\s+)?(new\s+)?(mock\s+)?interview\b"
+)
+QUESTION_FORM = re.compile(
+    r"^\s*(how|what|why|where|when|which|who|is|are|am|does|do|did|can|could|should|"
+    r"will|would|may|might|shall|have|has)\b"
+)
+
+_counts = {}
+_lock = threading.Lock()
+
+
+def _count(intent):
+    with _lock:
+        _counts[intent] = _counts.get(intent, 0) + 1
+
+
+def is_question(text):
+    """Questions are answered, never acted on."""
+    lowered = text.lower().strip()
+    return bool(QUESTION_FORM.search(lowered)) or lowered.endswith("?")
+
+
+def route_support_message(text):
+    """
+    Decide how a support message is handled before any LLM call.
+    Returns {"intent": ..., "reply": ...}; reply is None when the action
+    or the LLM should produce the answer.
+    """
+    lowered = text.lower().strip()
+
+    if START_INTERVIEW.search(lowered) and not is_question(lowered):
+        decision = {"intent": "start_interview", "reply": None}
+    elif WHO_ARE_YOU.match(lowered):
+        decision = {"intent": "who_are_you", "reply": WHO_ARE_YOU_REPLY}
+    elif HOW_ARE_YOU.match(lowered):
+        decision = {"intent": "how_are_you", "reply": HOW_ARE_YOU_REPLY}
+    elif GREETING.match(lowered):
+        decision = {"intent": "greeting", "reply": GREETING_REPLY}
+    elif THANKS.match(lowered):
+        decision = {"intent": "thanks", "reply": THANKS_REPLY}
+    elif OFF_TOPIC.search(lowered) and not PLATFORM_TERMS.search(lowered):
+        decision = {"intent": "out_of_scope", "reply": OUT_OF_SCOPE_REPLY}
+    else:
+        decision = {"intent": "llm", "reply": None}
+
+    _count(decision["intent"])
+    return decision
+
+
+def routing_stats():
+    with _lock:
+        return dict(_counts)
+
+
+register_stats("support_routes", routing_stats, label="intent")
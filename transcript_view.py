@@ -0,0 +1,57 @@
+import os
+import streamlit as st
+
+# newest messages shown per page; older pages load on demand
+TRANSCRIPT_PAGE_SIZE = int(os.getenv("TRANSCRIPT_PAGE_SIZE", "50"))
+
+
+def message_html(role_type, content):
+    if role_type == "user":
+        return f"""
+                <div style='text-align: right; margin: 10px 0;'>
+                    <div style='background: #4F46E5; color: white; padding: 12px;
+                         border-radius: 15px 15px 0 15px; display: inline-block; max-width: 80%;'>
+                        {content}
+                    </div>
+                    <div style='font-size: 12px; color: #666; text-align: right; padding: 2px 10px;'>
+                        👤 You
+                    </div>
+                </div>
+                """
+    return f"""
+                <div style='text-align: left; margin: 10px 0;'>
+                    <div style='background: #f0f0f0; color: #333; padding: 12px;
+                         border-radius: 15px 15px 15px 0; display: inline-block; max-width: 80%;'>
+                        {content}
+                    </div>
+                    <div style='font-size: 12px; color: #666; text-align: left; padding: 2px 10px;'>
+                        🤖 AI Interviewer
+                    </div>
+                </div>
+                """
+
+
+@st.fragment
+def render_transcript(interview):
+    """
+    Draw the newest page(s) of the transcript as a single markdown element.
+    Only the visible messages are rendered, on each run; nothing is kept
+    in session state beyond the transcript itself.
+    "Show earlier messages" reruns only this fragment.
+    """
+    transcript = interview["memory"].chat_memory
+
+    pages_key = f"transcript_pages_{interview['id']}"
+    pages = st.session_state.get(pages_key, 1)
+    start = max(0, len(transcript) - pages * TRANSCRIPT_PAGE_SIZE)
+
+    if start > 0:
+        if st.button(f"⬆️ Show earlier messages ({start} more)", key=f"earlier_{interview['id']}",
+                     use_container_width=True):
+            st.session_state[pages_key] = pages + 1
+            st.rerun(scope="fragment")
+
+    st.markdown("\n".join(
+        message_html("user" if role_type == "human" else "assistant", content)
+        for role_type, content in transcript.turns(start)
+    ), unsafe_allow_html=True)